@@ -6,28 +6,44 @@ Check package structure and readiness for PyPI upload
 import os
 import sys
 
-def check_file_exists(path, description):
+_directory_cache = {}
+
+def _directory_entries(path):
+    """Map entry names to is_dir for a directory, scanning it only once"""
+    if path not in _directory_cache:
+        try:
+            with os.scandir(path) as entries:
+                _directory_cache[path] = {entry.name: entry.is_dir() for entry in entries}
+        except OSError:
+            _directory_cache[path] = {}
+    return _directory_cache[path]
+
+def check_file_exists(path, description, out):
     """Check if a file exists and report status"""
-    if os.path.exists(path):
-        print(f"✅ {description}: {path}")
+    parent, name = os.path.split(path)
+    if name in _directory_entries(parent or "."):
+        out.append(f"✅ {description}: {path}")
         return True
     else:
-        print(f"❌ {description}: {path} (MISSING)")
+        out.append(f"❌ {description}: {path} (MISSING)")
         return False
 
-def check_directory_exists(path, description):
+def check_directory_exists(path, description, out):
     """Check if a directory exists and report status"""
-    if os.path.isdir(path):
-        file_count = len(os.listdir(path))
-        print(f"✅ {description}: {path} ({file_count} files)")
+    parent, name = os.path.split(path)
+    if _directory_entries(parent or ".").get(name):
+        file_count = len(_directory_entries(path))
+        out.append(f"✅ {description}: {path} ({file_count} files)")
         return True
     else:
-        print(f"❌ {description}: {path} (MISSING)")
+        out.append(f"❌ {description}: {path} (MISSING)")
         return False
 
 def main():
-    print("🔍 PKI Token Network - Package Structure Check")
-    print("=" * 60)
+    # Report lines are collected and written once at the end
+    out = []
+    out.append("🔍 PKI Token Network - Package Structure Check")
+    out.append("=" * 60)
     
     checks_passed = 0
     total_checks = 0
@@ -44,10 +60,10 @@ def main():
         (".gitignore", "Git ignore rules")
     ]
     
-    print("\n📄 Required Files:")
-    print("-" * 30)
+    out.append("\n📄 Required Files:")
+    out.append("-" * 30)
     for file_path, description in files_to_check:
-        if check_file_exists(file_path, description):
+        if check_file_exists(file_path, description, out):
             checks_passed += 1
         total_checks += 1
     
@@ -57,10 +73,10 @@ def main():
         ("tests", "Test suite"),
     ]
     
-    print("\n📁 Required Directories:")
-    print("-" * 30)
+    out.append("\n📁 Required Directories:")
+    out.append("-" * 30)
     for dir_path, description in directories_to_check:
-        if check_directory_exists(dir_path, description):
+        if check_directory_exists(dir_path, description, out):
             checks_passed += 1
         total_checks += 1
     
@@ -74,10 +90,10 @@ def main():
         ("pki_token_network/scripts.py", "Entry point scripts")
     ]
     
-    print("\n🐍 Python Package Modules:")
-    print("-" * 30)
+    out.append("\n🐍 Python Package Modules:")
+    out.append("-" * 30)
     for file_path, description in package_files:
-        if check_file_exists(file_path, description):
+        if check_file_exists(file_path, description, out):
             checks_passed += 1
         total_checks += 1
     
@@ -89,10 +105,10 @@ def main():
         ("PYPI-QUICKSTART.md", "Quick start guide")
     ]
     
-    print("\n📚 Documentation:")
-    print("-" * 30)
+    out.append("\n📚 Documentation:")
+    out.append("-" * 30)
     for file_path, description in doc_files:
-        if check_file_exists(file_path, description):
+        if check_file_exists(file_path, description, out):
             checks_passed += 1
         total_checks += 1
     
@@ -102,39 +118,42 @@ def main():
         ("upload.sh", "Upload script")
     ]
     
-    print("\n🔧 Build Scripts:")
-    print("-" * 30)
+    out.append("\n🔧 Build Scripts:")
+    out.append("-" * 30)
     for file_path, description in script_files:
-        if check_file_exists(file_path, description):
+        if check_file_exists(file_path, description, out):
             checks_passed += 1
         total_checks += 1
     
     # Summary
-    print("\n" + "=" * 60)
-    print("📊 PACKAGE READINESS SUMMARY")
-    print("=" * 60)
+    out.append("\n" + "=" * 60)
+    out.append("📊 PACKAGE READINESS SUMMARY")
+    out.append("=" * 60)
     
     success_rate = (checks_passed / total_checks) * 100
-    print(f"Files/Directories: {checks_passed}/{total_checks} ({success_rate:.1f}%)")
+    out.append(f"Files/Directories: {checks_passed}/{total_checks} ({success_rate:.1f}%)")
     
     if success_rate >= 95:
-        print("🎉 PACKAGE READY FOR PYPI!")
-        print("\n🚀 Next Steps:")
-        print("1. Install build tools: pip install build twine")
-        print("2. Update author info in setup.py and pyproject.toml")
-        print("3. Run: python -m build")
-        print("4. Run: twine upload --repository testpypi dist/*")
-        print("5. Test: pip install --index-url https://test.pypi.org/simple/ pki-token-network")
-        print("6. Run: twine upload dist/*")
-        return True
+        out.append("🎉 PACKAGE READY FOR PYPI!")
+        out.append("\n🚀 Next Steps:")
+        out.append("1. Install build tools: pip install build twine")
+        out.append("2. Update author info in setup.py and pyproject.toml")
+        out.append("3. Run: python -m build")
+        out.append("4. Run: twine upload --repository testpypi dist/*")
+        out.append("5. Test: pip install --index-url https://test.pypi.org/simple/ pki-token-network")
+        out.append("6. Run: twine upload dist/*")
+        ready = True
     elif success_rate >= 80:
-        print("⚠️  PACKAGE MOSTLY READY")
-        print("   Some optional files missing, but core structure is good")
-        return True
+        out.append("⚠️  PACKAGE MOSTLY READY")
+        out.append("   Some optional files missing, but core structure is good")
+        ready = True
     else:
-        print("❌ PACKAGE NOT READY")
-        print("   Major files/directories missing")
-        return False
+        out.append("❌ PACKAGE NOT READY")
+        out.append("   Major files/directories missing")
+        ready = False
+    
+    sys.stdout.write("\n".join(out) + "\n")
+    return ready
 
 if __name__ == "__main__":
     success = main()
@@ -14,7 +14,7 @@ try:
     from .core import PKITokenNetwork, SecureToken
     from .cli import main as cli_main
     from .manager import PKIWizard
-    from .packager import create_secure_token_package
+    from .packager import create_secure_token_package, create_packages_bulk
 except ImportError:
     # Handle import errors gracefully during setup
     pass
@@ -24,5 +24,6 @@ __all__ = [
     'SecureToken', 
     'PKIWizard',
     'create_secure_token_package',
+    'create_packages_bulk',
     'cli_main'
 ]
\ No newline at end of file
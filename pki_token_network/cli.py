@@ -3,6 +3,7 @@
 import argparse
 import sys
 import json
+from functools import lru_cache
 from .core import PKITokenNetwork
 
 def create_master(args):
@@ -74,38 +75,78 @@ def verify_as_issuer(args):
         print(f"  {i+1}. {step}")
 
 def show_token(args):
-    network = PKITokenNetwork(args.storage_dir)
-    token_info = network.get_token_info(args.node_id)
+    # Point query: read just this node's token file instead of the whole store
+    token = PKITokenNetwork.load_one(args.storage_dir, args.node_id)
     
-    if token_info:
+    if token:
         print(f"Token information for node: {args.node_id}")
-        print(json.dumps(token_info, indent=2))
+        print(json.dumps(token.to_dict(), indent=2))
     else:
         print(f"No token found for node: {args.node_id}")
         sys.exit(1)
 
 def list_tokens(args):
     network = PKITokenNetwork(args.storage_dir)
-    tokens = network.list_all_tokens()
     
-    if not tokens:
+    if not network.tokens:
         print("No tokens found in the network")
         return
     
-    print(f"Found {len(tokens)} tokens in the network:")
+    print(f"Found {len(network.tokens)} tokens in the network:")
     print("-" * 80)
     
-    for token in tokens:
-        token_type = "MASTER" if token['issuer_token_hash'] is None else "NODE"
-        print(f"Node ID: {token['node_id']}")
+    # Print straight from the loaded tokens; no per-token dicts are needed
+    for token in network.tokens.values():
+        token_type = "MASTER" if token.issuer_token_hash is None else "NODE"
+        print(f"Node ID: {token.node_id}")
         print(f"Type: {token_type}")
-        print(f"Token Hash: {token['token_hash']}")
-        if token['issuer_id']:
-            print(f"Issued by: {token['issuer_id']}")
-        print(f"Created: {token['timestamp']}")
+        print(f"Token Hash: {token.token_hash}")
+        if token.issuer_id:
+            print(f"Issued by: {token.issuer_id}")
+        print(f"Created: {token.timestamp}")
         print("-" * 80)
 
-def main():
+def bulk(args):
+    """Apply a JSON list of create-master/issue operations with one network load"""
+    try:
+        if args.from_json == '-':
+            operations = json.load(sys.stdin)
+        else:
+            with open(args.from_json) as f:
+                operations = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    
+    if not isinstance(operations, list) or not all(isinstance(op, dict) for op in operations):
+        print("Error: bulk input must be a JSON list of operation objects")
+        sys.exit(1)
+    
+    network = PKITokenNetwork(args.storage_dir)
+    for operation in operations:
+        try:
+            op = operation.get('op')
+            if op == 'create-master':
+                master_token = network.create_master_token(operation['node_id'])
+                print(f"Master token created for node: {operation['node_id']}")
+                print(f"Token hash: {master_token.token_hash}")
+            elif op == 'issue':
+                new_token = network.issue_token(operation['issuer'], operation['node_id'],
+                                                operation.get('data'))
+                print(f"Token issued to node: {operation['node_id']}")
+                print(f"Issued by: {operation['issuer']}")
+                print(f"Token hash: {new_token.token_hash}")
+            else:
+                raise ValueError(f"Unknown operation: {op}")
+        except (ValueError, KeyError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+    
+    print(f"Applied {len(operations)} operations")
+
+@lru_cache(maxsize=1)
+def _get_parser() -> argparse.ArgumentParser:
+    """Build the argument parser once; parse_args() leaves it unchanged"""
     parser = argparse.ArgumentParser(description="PKI Token Network CLI")
     parser.add_argument("--storage-dir", default="token_storage", 
                        help="Directory to store token files (default: token_storage)")
@@ -147,7 +188,17 @@ def main():
     list_parser = subparsers.add_parser('list', help='List all tokens')
     list_parser.set_defaults(func=list_tokens)
     
-    args = parser.parse_args()
+    # Apply many operations in one run
+    bulk_parser = subparsers.add_parser('bulk', help='Apply create-master/issue operations from JSON')
+    bulk_parser.add_argument('--from-json', required=True, metavar='FILE',
+                            help='JSON list of {"op": "create-master"|"issue", ...} objects ("-" for stdin)')
+    bulk_parser.set_defaults(func=bulk)
+    
+    return parser
+
+def main(argv=None):
+    parser = _get_parser()
+    args = parser.parse_args(argv)
     
     if not args.command:
         parser.print_help()
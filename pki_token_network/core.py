@@ -7,26 +7,141 @@ from datetime import datetime, timezone
 from typing import Dict, List, Optional, Tuple, Set
 import os
 import base64
-from cryptography.hazmat.primitives.asymmetric import rsa, padding
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa, padding
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.serialization import load_pem_private_key, load_pem_public_key
 
+try:
+    import orjson  # optional, install with the "fast" extra
+except ImportError:
+    orjson = None
+
+_UTC = timezone.utc
+_HASH_SEPARATOR = b":"
+_HASH_CHUNK_CHARS = 1 << 16
+
+# Cloning an initialised context is cheaper than constructing a new one
+_SHA256_BASE = hashlib.sha256()
+
+# Token stores, issuance batches and signature sweeps at least this large are
+# handled with a thread pool so file I/O and signature checks overlap
+_PARALLEL_LOAD_THRESHOLD = 64
+_LOAD_WORKERS = 8
+
+# Key file serialization parameters, bound once
+_PEM = serialization.Encoding.PEM
+_PKCS8 = serialization.PrivateFormat.PKCS8
+_SPKI = serialization.PublicFormat.SubjectPublicKeyInfo
+_NO_ENCRYPTION = serialization.NoEncryption()
+
+# Domain-separation prefixes so a leaf hash can never be passed off as an
+# interior node (and vice versa)
+_MERKLE_LEAF_PREFIX = b"\x00"
+_MERKLE_NODE_PREFIX = b"\x01"
+
+# Padding and hash parameters for RSA keys from older stores; these are
+# immutable, so one instance serves every sign and verify call
+_RSA_HASH = hashes.SHA256()
+_RSA_PSS_PADDING = padding.PSS(
+    mgf=padding.MGF1(_RSA_HASH),
+    salt_length=padding.PSS.MAX_LENGTH
+)
+
+
+def _read_token_file(path: str):
+    """Read a token file, returning the exception instead of raising it"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError as e:
+        return e
+
+
+def _json_dumps(obj) -> bytes:
+    """Serialize to compact JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+
+def _json_loads(data: bytes):
+    """Parse JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _sign(private_key, content: bytes) -> bytes:
+    """Sign content with an Ed25519 key, or RSA-PSS for keys from older stores"""
+    if isinstance(private_key, rsa.RSAPrivateKey):
+        return private_key.sign(
+            content,
+            _RSA_PSS_PADDING,
+            _RSA_HASH
+        )
+    return private_key.sign(content)
+
+
+def _verify_signature(public_key, signature: bytes, content: bytes):
+    """Verify a signature made by _sign(); raises InvalidSignature on mismatch"""
+    if isinstance(public_key, rsa.RSAPublicKey):
+        public_key.verify(
+            signature,
+            content,
+            _RSA_PSS_PADDING,
+            _RSA_HASH
+        )
+    else:
+        public_key.verify(signature, content)
+
+
+def _merkle_leaf(token_hash: str) -> bytes:
+    """Merkle leaf for a token hash"""
+    return hashlib.sha256(_MERKLE_LEAF_PREFIX + token_hash.encode()).digest()
+
+
+def _merkle_node(left: bytes, right: bytes) -> bytes:
+    """Merkle interior node over two child hashes"""
+    return hashlib.sha256(_MERKLE_NODE_PREFIX + left + right).digest()
+
+
+@lru_cache(maxsize=1024)
+def load_public_key(pem: bytes):
+    """Parse a PEM public key, reusing the key object for PEM seen before"""
+    return load_pem_public_key(pem)
+
+
+def _validate_node_id(node_id: str):
+    """Raise ValueError unless node_id is a usable node identifier"""
+    if not node_id or not isinstance(node_id, str):
+        raise ValueError("Node ID must be a non-empty string")
+    if len(node_id) > 64:
+        raise ValueError("Node ID must be 64 characters or less")
+    if not node_id.replace('_', '').replace('-', '').replace('.', '').isalnum():
+        raise ValueError("Node ID must contain only alphanumeric characters, hyphens, underscores, and dots")
+
 class SecureToken:
+    # Networks hold every token in memory; slots keep instances small
+    __slots__ = (
+        'node_id', 'issuer_token_hash', 'issuer_id', 'timestamp', 'token_id',
+        'token_data', 'token_hash', 'master_id', 'hierarchy_level',
+        'master_signature', 'issuer_signature', 'delegation_proof',
+        'merkle_proof', 'verification_paths', '_dict_cache', '_json_cache',
+    )
+    
     def __init__(self, node_id: str, issuer_token_hash: Optional[str] = None, 
                  issuer_id: Optional[str] = None, token_data: Optional[str] = None,
                  master_id: Optional[str] = None, hierarchy_level: int = 0):
-        if not node_id or not isinstance(node_id, str):
-            raise ValueError("Node ID must be a non-empty string")
-        if len(node_id) > 64:
-            raise ValueError("Node ID must be 64 characters or less")
-        if not node_id.replace('_', '').replace('-', '').replace('.', '').isalnum():
-            raise ValueError("Node ID must contain only alphanumeric characters, hyphens, underscores, and dots")
+        _validate_node_id(node_id)
         
         # Original fields for backward compatibility
         self.node_id = node_id
         self.issuer_token_hash = issuer_token_hash
         self.issuer_id = issuer_id
-        self.timestamp = datetime.now(timezone.utc).isoformat()
+        self.timestamp = datetime.now(_UTC).isoformat()
         self.token_id = str(uuid.uuid4())
         self.token_data = token_data or f"token_for_{node_id}"
         
@@ -38,15 +153,64 @@ class SecureToken:
         self.delegation_proof: Optional[str] = None
         self.merkle_proof: Optional[Dict] = None
         self.verification_paths: Set[str] = {"chain"}  # Available verification methods
+        self._dict_cache: Optional[Dict] = None
+        self._json_cache: Optional[bytes] = None
         
         # Generate token hash (must be last)
         self.token_hash = self._generate_token_hash()
     
     def _generate_token_hash(self) -> str:
-        token_content = f"{self.node_id}:{self.issuer_token_hash}:{self.issuer_id}:{self.timestamp}:{self.token_id}:{self.token_data}"
-        return hashlib.sha256(token_content.encode()).hexdigest()
+        # Hash of "node_id:issuer_token_hash:issuer_id:timestamp:token_id:token_data"
+        data = str(self.token_data)
+        h = _SHA256_BASE.copy()
+        if len(data) < _HASH_CHUNK_CHARS:
+            # Typical tokens: one encode and one update of the whole preimage
+            # is about twice as fast as feeding eleven small pieces
+            h.update(f"{self.node_id}:{self.issuer_token_hash}:{self.issuer_id}:"
+                     f"{self.timestamp}:{self.token_id}:{data}".encode())
+            return h.hexdigest()
+        
+        # Large payloads: feed the fields straight into the hasher instead of
+        # building the joined string first
+        h.update(str(self.node_id).encode())
+        for field in (self.issuer_token_hash, self.issuer_id, self.timestamp,
+                      self.token_id):
+            h.update(_HASH_SEPARATOR)
+            h.update(str(field).encode())
+        h.update(_HASH_SEPARATOR)
+        
+        # token_data may carry large payloads; encode it piecewise so hashing
+        # never holds a second full-size copy of it
+        for start in range(0, len(data), _HASH_CHUNK_CHARS):
+            h.update(data[start:start + _HASH_CHUNK_CHARS].encode())
+        return h.hexdigest()
     
     def to_dict(self) -> Dict:
+        cached = self._cached_dict()
+        token_dict = dict(cached)
+        token_dict['verification_paths'] = list(cached['verification_paths'])
+        return token_dict
+    
+    def to_json(self) -> bytes:
+        """Compact JSON encoding of to_dict(), as written to token files"""
+        if self._json_cache is None:
+            self._json_cache = _json_dumps(self._cached_dict())
+        return self._json_cache
+    
+    def invalidate_cache(self):
+        """Drop the memoised to_dict()/to_json() results after editing token fields"""
+        self._dict_cache = None
+        self._json_cache = None
+    
+    def _cached_dict(self) -> Dict:
+        # Token fields do not change once issued, except through the
+        # add_*_signature methods, which drop this cache. Code that edits
+        # fields directly must call invalidate_cache().
+        if self._dict_cache is None:
+            self._dict_cache = self._build_dict()
+        return self._dict_cache
+    
+    def _build_dict(self) -> Dict:
         return {
             # Original fields for backward compatibility
             'node_id': self.node_id,
@@ -64,7 +228,7 @@ class SecureToken:
             'issuer_signature': self.issuer_signature,
             'delegation_proof': self.delegation_proof,
             'merkle_proof': self.merkle_proof,
-            'verification_paths': list(self.verification_paths)
+            'verification_paths': sorted(self.verification_paths)  # deterministic output
         }
     
     @classmethod
@@ -87,29 +251,28 @@ class SecureToken:
         token.delegation_proof = data.get('delegation_proof')
         token.merkle_proof = data.get('merkle_proof')
         token.verification_paths = set(data.get('verification_paths', ['chain']))
+        token._dict_cache = None
+        token._json_cache = None
         
         return token
     
+    def _sign_content(self, signer_id: str) -> bytes:
+        """Bytes covered by a master or issuer signature (excludes the signature itself)"""
+        # Rebuilt from the current fields on each call rather than cached, so
+        # in-memory edits to node_id, token_hash or timestamp fail verification
+        return f"{self.node_id}:{self.token_hash}:{signer_id}:{self.timestamp}".encode()
+    
     def add_master_signature(self, master_private_key, master_id: str):
         """Add master signature to token for direct verification"""
         if not master_private_key:
             return
         
-        # Create content to sign (excludes the signature itself)
-        sign_content = f"{self.node_id}:{self.token_hash}:{master_id}:{self.timestamp}"
-        
         try:
-            signature = master_private_key.sign(
-                sign_content.encode(),
-                padding.PSS(
-                    mgf=padding.MGF1(hashes.SHA256()),
-                    salt_length=padding.PSS.MAX_LENGTH
-                ),
-                hashes.SHA256()
-            )
+            signature = _sign(master_private_key, self._sign_content(master_id))
             self.master_signature = base64.b64encode(signature).decode('utf-8')
             self.master_id = master_id
             self.verification_paths.add("master-direct")
+            self.invalidate_cache()
         except Exception as e:
             # Graceful degradation - token still works with chain verification
             pass
@@ -119,20 +282,11 @@ class SecureToken:
         if not issuer_private_key or not issuer_id:
             return
         
-        # Create content to sign
-        sign_content = f"{self.node_id}:{self.token_hash}:{issuer_id}:{self.timestamp}"
-        
         try:
-            signature = issuer_private_key.sign(
-                sign_content.encode(),
-                padding.PSS(
-                    mgf=padding.MGF1(hashes.SHA256()),
-                    salt_length=padding.PSS.MAX_LENGTH
-                ),
-                hashes.SHA256()
-            )
+            signature = _sign(issuer_private_key, self._sign_content(issuer_id))
             self.issuer_signature = base64.b64encode(signature).decode('utf-8')
             self.verification_paths.add("issuer-direct")
+            self.invalidate_cache()
         except Exception as e:
             # Graceful degradation
             pass
@@ -144,17 +298,8 @@ class SecureToken:
         
         try:
             signature = base64.b64decode(self.master_signature.encode('utf-8'))
-            sign_content = f"{self.node_id}:{self.token_hash}:{self.master_id}:{self.timestamp}"
             
-            master_public_key.verify(
-                signature,
-                sign_content.encode(),
-                padding.PSS(
-                    mgf=padding.MGF1(hashes.SHA256()),
-                    salt_length=padding.PSS.MAX_LENGTH
-                ),
-                hashes.SHA256()
-            )
+            _verify_signature(master_public_key, signature, self._sign_content(self.master_id))
             return True
         except Exception:
             return False
@@ -166,24 +311,18 @@ class SecureToken:
         
         try:
             signature = base64.b64decode(self.issuer_signature.encode('utf-8'))
-            sign_content = f"{self.node_id}:{self.token_hash}:{issuer_id}:{self.timestamp}"
             
-            issuer_public_key.verify(
-                signature,
-                sign_content.encode(),
-                padding.PSS(
-                    mgf=padding.MGF1(hashes.SHA256()),
-                    salt_length=padding.PSS.MAX_LENGTH
-                ),
-                hashes.SHA256()
-            )
+            _verify_signature(issuer_public_key, signature, self._sign_content(issuer_id))
             return True
         except Exception:
             return False
 
 class PKITokenNetwork:
-    def __init__(self, storage_dir: str = "token_storage"):
+    def __init__(self, storage_dir: Optional[str] = "token_storage"):
+        # storage_dir=None keeps the network in memory only: nothing is read
+        # from or written to disk
         self.storage_dir = storage_dir
+        self._persistent = storage_dir is not None
         self.tokens: Dict[str, SecureToken] = {}
         self.master_token: Optional[SecureToken] = None
         
@@ -191,32 +330,48 @@ class PKITokenNetwork:
         self.master_private_key = None
         self.master_public_key = None
         self.node_keys: Dict[str, Tuple[object, object]] = {}  # node_id -> (private, public)
+        self._public_pems: Dict[int, Tuple[object, bytes]] = {}  # id(public key) -> (key, PEM)
         
-        self._ensure_storage_dir()
-        self._load_keys()
-        self._load_tokens()
+        # Reverse issuer index: issuer node_id -> node_ids it issued
+        self._children: Dict[str, List[str]] = defaultdict(list)
+        
+        # Level index: hierarchy level -> node_ids at that level
+        self._levels: Dict[int, List[str]] = defaultdict(list)
+        
+        # Ancestor index: node_id -> issuer ids from its issuer up to the root
+        self._lineage: Dict[str, Tuple[str, ...]] = {}
+        
+        # Merkle tree over all token hashes, rebuilt lazily after changes:
+        # layers[0] are the leaves sorted by token hash, layers[-1] = [root]
+        self._merkle_layers: Optional[List[List[bytes]]] = None
+        self._merkle_index: Dict[str, int] = {}  # node_id -> leaf position
+        self._merkle_leaves: Dict[str, str] = {}  # node_id -> token_hash the tree was built from
+        
+        if self._persistent:
+            self._ensure_storage_dir()
+            self._load_keys()
+            self._load_tokens()
     
     def _ensure_storage_dir(self):
         os.makedirs(self.storage_dir, exist_ok=True)
         os.makedirs(os.path.join(self.storage_dir, "keys"), exist_ok=True)
     
-    def _generate_rsa_key_pair(self):
-        """Generate RSA key pair for cryptographic operations"""
-        private_key = rsa.generate_private_key(
-            public_exponent=65537,
-            key_size=2048
-        )
+    def _generate_key_pair(self):
+        """Generate an Ed25519 key pair for cryptographic operations"""
+        private_key = ed25519.Ed25519PrivateKey.generate()
         public_key = private_key.public_key()
         return private_key, public_key
     
     def _save_key_pair(self, node_id: str, private_key, public_key):
-        """Save RSA key pair to disk"""
+        """Save key pair to disk"""
+        if not self._persistent:
+            return
         try:
             # Save private key
             private_pem = private_key.private_bytes(
-                encoding=serialization.Encoding.PEM,
-                format=serialization.PrivateFormat.PKCS8,
-                encryption_algorithm=serialization.NoEncryption()
+                encoding=_PEM,
+                format=_PKCS8,
+                encryption_algorithm=_NO_ENCRYPTION
             )
             private_file = os.path.join(self.storage_dir, "keys", f"{node_id}_private.pem")
             with open(private_file, 'wb') as f:
@@ -224,9 +379,10 @@ class PKITokenNetwork:
             
             # Save public key
             public_pem = public_key.public_bytes(
-                encoding=serialization.Encoding.PEM,
-                format=serialization.PublicFormat.SubjectPublicKeyInfo
+                encoding=_PEM,
+                format=_SPKI
             )
+            self._public_pems[id(public_key)] = (public_key, public_pem)
             public_file = os.path.join(self.storage_dir, "keys", f"{node_id}_public.pem")
             with open(public_file, 'wb') as f:
                 f.write(public_pem)
@@ -235,7 +391,7 @@ class PKITokenNetwork:
             pass
     
     def _load_key_pair(self, node_id: str):
-        """Load RSA key pair from disk"""
+        """Load key pair from disk (Ed25519, or RSA from older stores)"""
         try:
             private_file = os.path.join(self.storage_dir, "keys", f"{node_id}_private.pem")
             public_file = os.path.join(self.storage_dir, "keys", f"{node_id}_public.pem")
@@ -245,18 +401,31 @@ class PKITokenNetwork:
                     private_key = load_pem_private_key(f.read(), password=None)
                 
                 with open(public_file, 'rb') as f:
-                    public_key = load_pem_public_key(f.read())
+                    public_pem = f.read()
+                public_key = load_public_key(public_pem)
+                # The file already holds the encoding packages need
+                self._public_pems[id(public_key)] = (public_key, public_pem)
                 
                 return private_key, public_key
         except Exception:
             pass
         return None, None
     
+    def public_key_pem(self, public_key) -> bytes:
+        """PEM (SubjectPublicKeyInfo) encoding of a public key, serialized once per key"""
+        cached = self._public_pems.get(id(public_key))
+        if cached is None or cached[0] is not public_key:
+            pem = public_key.public_bytes(
+                encoding=_PEM,
+                format=_SPKI
+            )
+            # Holding the key keeps its id from being reused by another object
+            cached = self._public_pems[id(public_key)] = (public_key, pem)
+        return cached[1]
+    
     def _load_keys(self):
         """Load all keys from storage"""
         keys_dir = os.path.join(self.storage_dir, "keys")
-        if not os.path.exists(keys_dir):
-            return
         
         # Load master keys
         self.master_private_key, self.master_public_key = self._load_key_pair("master")
@@ -273,37 +442,74 @@ class PKITokenNetwork:
     def _ensure_master_keys(self, master_node_id: str):
         """Ensure master keys exist, generate if necessary"""
         if not self.master_private_key or not self.master_public_key:
-            self.master_private_key, self.master_public_key = self._generate_rsa_key_pair()
+            self.master_private_key, self.master_public_key = self._generate_key_pair()
             self._save_key_pair("master", self.master_private_key, self.master_public_key)
     
     def _ensure_node_keys(self, node_id: str):
         """Ensure node keys exist, generate if necessary"""
         if node_id not in self.node_keys:
-            private_key, public_key = self._generate_rsa_key_pair()
+            private_key, public_key = self._generate_key_pair()
             self.node_keys[node_id] = (private_key, public_key)
             self._save_key_pair(node_id, private_key, public_key)
     
     def _save_token(self, token: SecureToken):
+        if not self._persistent:
+            return
         filename = f"{self.storage_dir}/{token.node_id}_token.json"
-        with open(filename, 'w') as f:
-            json.dump(token.to_dict(), f, indent=2)
+        # Token files are machine-read; compact output is smaller and faster
+        with open(filename, 'wb') as f:
+            f.write(token.to_json())
     
     def _load_tokens(self):
-        if not os.path.exists(self.storage_dir):
-            return
+        # _ensure_storage_dir() has already created the directory
+        # scandir yields the file type from the directory read itself, so no
+        # extra stat() is needed per entry
+        with os.scandir(self.storage_dir) as entries:
+            token_files = [(entry.name, entry.path) for entry in entries
+                           if entry.name.endswith('_token.json') and entry.is_file()]
+        
+        paths = [path for _, path in token_files]
+        if len(paths) >= _PARALLEL_LOAD_THRESHOLD:
+            with ThreadPoolExecutor(max_workers=_LOAD_WORKERS) as executor:
+                contents = list(executor.map(_read_token_file, paths))
+        else:
+            contents = map(_read_token_file, paths)
+        
+        # Parse and register in this thread so self.tokens is only touched here
+        for (filename, _), content in zip(token_files, contents):
+            try:
+                if isinstance(content, Exception):
+                    raise content
+                token = SecureToken.from_dict(_json_loads(content))
+                self.tokens[token.node_id] = token
+                self._levels[token.hierarchy_level].append(token.node_id)
+                if token.issuer_token_hash is None:
+                    self.master_token = token
+                else:
+                    self._children[token.issuer_id].append(token.node_id)
+            except Exception as e:
+                print(f"Error loading token from {filename}: {e}")
+    
+    @staticmethod
+    def load_one(storage_dir: str, node_id: str) -> Optional[SecureToken]:
+        """Read a single token from storage without loading the whole network"""
+        try:
+            _validate_node_id(node_id)  # also keeps node_id from escaping storage_dir
+        except ValueError:
+            return None
         
-        for filename in os.listdir(self.storage_dir):
-            if filename.endswith('_token.json'):
-                filepath = os.path.join(self.storage_dir, filename)
-                try:
-                    with open(filepath, 'r') as f:
-                        data = json.load(f)
-                        token = SecureToken.from_dict(data)
-                        self.tokens[token.node_id] = token
-                        if token.issuer_token_hash is None:
-                            self.master_token = token
-                except Exception as e:
-                    print(f"Error loading token from {filename}: {e}")
+        filename = f"{node_id}_token.json"
+        content = _read_token_file(os.path.join(storage_dir, filename))
+        if isinstance(content, FileNotFoundError):
+            return None
+        try:
+            if isinstance(content, Exception):
+                raise content
+            token = SecureToken.from_dict(_json_loads(content))
+        except Exception as e:
+            print(f"Error loading token from {filename}: {e}")
+            return None
+        return token if token.node_id == node_id else None
     
     def create_master_token(self, master_node_id: str) -> SecureToken:
         if self.master_token:
@@ -324,6 +530,8 @@ class PKITokenNetwork:
             
             self.master_token = master_token
             self.tokens[master_node_id] = master_token
+            self._levels[0].append(master_node_id)
+            self.clear_verification_cache()
             self._save_token(master_token)
             return master_token
         except Exception as e:
@@ -372,19 +580,64 @@ class PKITokenNetwork:
             self._ensure_node_keys(new_node_id)
             
             self.tokens[new_node_id] = new_token
+            self._children[issuer_node_id].append(new_node_id)
+            self._levels[hierarchy_level].append(new_node_id)
+            issuer_lineage = self._lineage.get(issuer_node_id)
+            if issuer_lineage is not None:
+                self._lineage[new_node_id] = (issuer_node_id,) + issuer_lineage
+            self._merkle_layers = None
             self._save_token(new_token)
             return new_token
         except Exception as e:
             raise ValueError(f"Failed to issue token: {str(e)}")
     
+    def issue_tokens_batch(self, requests: List[Tuple]) -> List[SecureToken]:
+        """Issue tokens for (issuer_node_id, new_node_id[, token_data]) tuples in order
+        
+        Key pairs for the new nodes are generated and saved up front, in
+        parallel for large batches, but only for the requests before the
+        first one that issue_token would reject, so a failing batch leaves
+        no keys behind for nodes that never get a token. Issuance stops at
+        the first failure; tokens issued before it are kept.
+        """
+        missing = []
+        issued = set(self.tokens) if self.master_token else set()
+        for request in requests:
+            issuer_node_id, new_node_id = request[0], request[1]
+            if (issuer_node_id not in issued or issuer_node_id == new_node_id
+                    or new_node_id in issued):
+                break  # issue_token reports it when the batch gets there
+            try:
+                _validate_node_id(new_node_id)
+            except ValueError:
+                break
+            issued.add(new_node_id)
+            if new_node_id not in self.node_keys:
+                missing.append(new_node_id)
+        
+        if len(missing) >= _PARALLEL_LOAD_THRESHOLD:
+            with ThreadPoolExecutor(max_workers=_LOAD_WORKERS) as pool:
+                list(pool.map(self._ensure_node_keys, missing))
+        else:
+            for node_id in missing:
+                self._ensure_node_keys(node_id)
+        
+        return [self.issue_token(*request) for request in requests]
+    
     def verify_token(self, node_id: str) -> Tuple[bool, List[str]]:
         if node_id not in self.tokens:
             return False, [f"Token for node {node_id} not found"]
         
         chain = []
+        on_path = set()
         current_token = self.tokens[node_id]
         
         while current_token:
+            # Tampered stores can link tokens into an issuer cycle
+            if current_token.node_id in on_path:
+                return False, chain + [f"Circular issuer reference at {current_token.node_id}"]
+            on_path.add(current_token.node_id)
+            
             chain.append(f"{current_token.node_id} -> {current_token.token_hash[:16]}...")
             
             if current_token.issuer_token_hash is None:
@@ -404,6 +657,81 @@ class PKITokenNetwork:
         
         return False, chain + ["Unexpected end of chain"]
     
+    def verify_all(self) -> Dict[str, bool]:
+        """Chain-verify every token in one pass, reusing results shared by siblings"""
+        valid: Dict[str, bool] = {}
+        
+        for node_id, token in self.tokens.items():
+            if node_id in valid:
+                continue
+            
+            # Walk up until reaching the master or a token already decided;
+            # every token on the walk shares the outcome of its issuer chain
+            path = []
+            on_path = set()
+            current = token
+            while True:
+                known = valid.get(current.node_id)
+                if known is not None:
+                    result = known
+                    break
+                if current.node_id in on_path:
+                    result = False  # issuer cycle
+                    break
+                path.append(current.node_id)
+                on_path.add(current.node_id)
+                
+                if current.issuer_token_hash is None:
+                    result = current == self.master_token
+                    break
+                issuer_token = self.tokens.get(current.issuer_id)
+                if issuer_token is None or issuer_token.token_hash != current.issuer_token_hash:
+                    result = False
+                    break
+                current = issuer_token
+            
+            for walked_id in path:
+                valid[walked_id] = result
+            valid[node_id] = result
+        
+        return valid
+    
+    def clear_verification_cache(self):
+        """Forget cached verifications and rebuild indexes (call after editing tokens in place)"""
+        self._lineage.clear()
+        self._merkle_layers = None
+        
+        self._levels.clear()
+        self._children.clear()
+        for token in self.tokens.values():
+            self._levels[token.hierarchy_level].append(token.node_id)
+            if token.issuer_token_hash is not None:
+                self._children[token.issuer_id].append(token.node_id)
+    
+    def _lineage_of(self, node_id: str) -> Optional[Tuple[str, ...]]:
+        """Issuer ids from node_id's issuer up to the root, or None if the chain is broken"""
+        path = []
+        on_path = set()
+        current = node_id
+        while current not in self._lineage:
+            token = self.tokens.get(current)
+            if token is None or current in on_path:
+                return None  # missing issuer or issuer cycle
+            if not token.issuer_id:
+                self._lineage[current] = ()
+                break
+            path.append(current)
+            on_path.add(current)
+            current = token.issuer_id
+        
+        # Fill in every node walked, from the known ancestor back down
+        lineage = self._lineage[current]
+        for walked_id in reversed(path):
+            lineage = (current,) + lineage
+            self._lineage[walked_id] = lineage
+            current = walked_id
+        return self._lineage[node_id]
+    
     def verify_token_direct_master(self, node_id: str) -> Tuple[bool, List[str]]:
         """Verify token using master signature only (no intermediate tokens needed)"""
         if node_id not in self.tokens:
@@ -424,6 +752,23 @@ class PKITokenNetwork:
         else:
             return False, ["Master signature verification failed"]
     
+    def verify_all_signatures(self) -> Dict[str, bool]:
+        """Check every token's master signature, in parallel for large networks"""
+        master_public_key = self.master_public_key
+        
+        def check(token: SecureToken) -> bool:
+            return ("master-direct" in token.verification_paths
+                    and token.verify_master_signature(master_public_key))
+        
+        tokens = list(self.tokens.values())
+        if len(tokens) >= _PARALLEL_LOAD_THRESHOLD:
+            # cryptography releases the GIL while verifying
+            with ThreadPoolExecutor(max_workers=_LOAD_WORKERS) as executor:
+                results = list(executor.map(check, tokens))
+        else:
+            results = [check(token) for token in tokens]
+        return {token.node_id: result for token, result in zip(tokens, results)}
+    
     def verify_token_as_issuer(self, issuer_node_id: str, descendant_node_id: str) -> Tuple[bool, List[str]]:
         """Verify that a token was issued by a specific issuer (direct or indirect)"""
         if descendant_node_id not in self.tokens:
@@ -436,20 +781,26 @@ class PKITokenNetwork:
         
         # Check direct issuance
         if descendant_token.issuer_id == issuer_node_id:
-            # Verify issuer signature if available
-            if issuer_node_id in self.node_keys and "issuer-direct" in descendant_token.verification_paths:
-                _, issuer_public_key = self.node_keys[issuer_node_id]
-                if descendant_token.verify_issuer_signature(issuer_public_key, issuer_node_id):
-                    return True, [f"Direct issuer signature verified: {issuer_node_id} → {descendant_node_id}"]
-                else:
-                    return False, ["Direct issuer signature verification failed"]
-            else:
-                # Fall back to hash chain verification
-                return self._verify_direct_issuance(issuer_node_id, descendant_node_id)
+            return self._verify_direct_issuer(issuer_node_id, descendant_token)
         
         # Check indirect issuance (traverse up the chain)
         return self._verify_indirect_issuance(issuer_node_id, descendant_node_id)
     
+    def _verify_direct_issuer(self, issuer_node_id: str, descendant_token: SecureToken) -> Tuple[bool, List[str]]:
+        """Verify a token against the issuer named in its issuer_id"""
+        descendant_node_id = descendant_token.node_id
+        
+        # Verify issuer signature if available
+        if issuer_node_id in self.node_keys and "issuer-direct" in descendant_token.verification_paths:
+            _, issuer_public_key = self.node_keys[issuer_node_id]
+            if descendant_token.verify_issuer_signature(issuer_public_key, issuer_node_id):
+                return True, [f"Direct issuer signature verified: {issuer_node_id} → {descendant_node_id}"]
+            else:
+                return False, ["Direct issuer signature verification failed"]
+        else:
+            # Fall back to hash chain verification
+            return self._verify_direct_issuance(issuer_node_id, descendant_node_id)
+    
     def _verify_direct_issuance(self, issuer_node_id: str, descendant_node_id: str) -> Tuple[bool, List[str]]:
         """Verify direct parent-child relationship"""
         descendant_token = self.tokens[descendant_node_id]
@@ -462,10 +813,27 @@ class PKITokenNetwork:
     
     def _verify_indirect_issuance(self, issuer_node_id: str, descendant_node_id: str) -> Tuple[bool, List[str]]:
         """Verify indirect ancestor-descendant relationship"""
+        lineage = self._lineage_of(descendant_node_id)
+        if lineage is not None:
+            # Same result and path as the walk below, from the ancestor index
+            chain = [descendant_node_id] if lineage else []
+            if issuer_node_id in lineage:
+                chain.extend(lineage[:lineage.index(issuer_node_id)])
+                chain.append(f"{issuer_node_id} (issuer found)")
+                return True, chain
+            chain.extend(lineage[:-1])
+            return False, chain + [f"Issuer {issuer_node_id} not found in chain"]
+        
+        # Broken chain: walk it to report where it ends
         chain = []
+        on_path = set()
         current_token = self.tokens[descendant_node_id]
         
         while current_token and current_token.issuer_id:
+            if current_token.node_id in on_path:
+                chain.append(f"Circular issuer reference at {current_token.node_id}")
+                return False, chain
+            on_path.add(current_token.node_id)
             chain.append(f"{current_token.node_id}")
             
             if current_token.issuer_id == issuer_node_id:
@@ -487,21 +855,193 @@ class PKITokenNetwork:
         # Try chain verification
         results["chain"] = self.verify_token(node_id)
         
-        # Try master direct verification
-        if node_id in self.tokens and "master-direct" in self.tokens[node_id].verification_paths:
-            results["master-direct"] = self.verify_token_direct_master(node_id)
-        
-        # Try issuer verification (if not master)
-        if node_id in self.tokens:
-            token = self.tokens[node_id]
+        token = self.tokens.get(node_id)
+        if token is not None:
+            # Try master direct verification
+            if "master-direct" in token.verification_paths:
+                results["master-direct"] = self.verify_token_direct_master(node_id)
+            
+            # Try issuer verification (if not master); the issuer is the
+            # token's own issuer_id, so go straight to the direct check
             if token.issuer_id and token.issuer_id in self.tokens:
-                results["issuer-direct"] = self.verify_token_as_issuer(token.issuer_id, node_id)
+                results["issuer-direct"] = self._verify_direct_issuer(token.issuer_id, token)
         
         # Determine overall result
         any_valid = any(result[0] for result in results.values())
         
         return any_valid, results
     
+    def _merkle_tree(self) -> List[List[bytes]]:
+        """Return the Merkle layers, rebuilding them if tokens have changed"""
+        if self._merkle_layers is None or self._merkle_stale():
+            ordered = sorted(self.tokens.values(), key=lambda t: t.token_hash)
+            self._merkle_index = {t.node_id: i for i, t in enumerate(ordered)}
+            self._merkle_leaves = {t.node_id: t.token_hash for t in ordered}
+            
+            layer = [_merkle_leaf(t.token_hash) for t in ordered]
+            layers = [layer]
+            while len(layer) > 1:
+                # An unpaired last node is promoted to the next layer as is
+                parents = [_merkle_node(layer[i], layer[i + 1])
+                           for i in range(0, len(layer) - 1, 2)]
+                if len(layer) % 2:
+                    parents.append(layer[-1])
+                layer = parents
+                layers.append(layer)
+            self._merkle_layers = layers
+        return self._merkle_layers
+    
+    def _merkle_stale(self) -> bool:
+        """True if tokens were added, removed or replaced since the tree was built
+        
+        Edits straight to the tokens dict bypass issue_token, so the built
+        (node_id, token_hash) pairs are compared against the current ones.
+        """
+        leaves = self._merkle_leaves
+        if len(leaves) != len(self.tokens):
+            return True
+        return any(leaves.get(node_id) != token.token_hash for node_id, token in self.tokens.items())
+    
+    def merkle_root(self) -> Optional[str]:
+        """Hex Merkle root over every token hash, or None for an empty network"""
+        layers = self._merkle_tree()
+        return layers[-1][0].hex() if layers[0] else None
+    
+    def _merkle_cached_level(self) -> int:
+        """Layer that local verifications stop at: halfway up the tree"""
+        return (len(self._merkle_tree()) - 1) // 2
+    
+    def merkle_cached_layer(self) -> Tuple[int, List[str]]:
+        """The cached mid-tree layer as (level, hex hashes) for short proofs"""
+        level = self._merkle_cached_level()
+        return level, [node.hex() for node in self._merkle_layers[level]]
+    
+    def get_merkle_proof(self, node_id: str, levels: Optional[int] = None) -> Optional[List[Tuple[str, str]]]:
+        """Sibling hashes from node_id's leaf up to the root, as (hex, 'left'|'right')
+        
+        With levels, the proof stops that many layers above the leaves, for
+        checking against merkle_cached_layer() instead of the root.
+        """
+        layers = self._merkle_tree()
+        if node_id not in self._merkle_index:
+            return None
+        
+        proof = []
+        index = self._merkle_index[node_id]
+        for layer in layers[:-1 if levels is None else levels]:
+            sibling = index ^ 1
+            if sibling < len(layer):
+                proof.append((layer[sibling].hex(), 'left' if sibling < index else 'right'))
+            index //= 2
+        return proof
+    
+    @staticmethod
+    def _replay_merkle_proof(token_hash: str, proof: List[Tuple[str, str]]) -> Optional[bytes]:
+        """Hash a leaf up through its proof, or None if the proof is malformed"""
+        current = _merkle_leaf(token_hash)
+        try:
+            for sibling, position in proof:
+                if position == 'left':
+                    current = _merkle_node(bytes.fromhex(sibling), current)
+                else:
+                    current = _merkle_node(current, bytes.fromhex(sibling))
+        except (TypeError, ValueError):
+            return None
+        return current
+    
+    @staticmethod
+    def verify_merkle_proof(token_hash: str, proof: List[Tuple[str, str]], root: str) -> bool:
+        """Check a proof from get_merkle_proof() against a Merkle root"""
+        current = PKITokenNetwork._replay_merkle_proof(token_hash, proof)
+        return current is not None and current.hex() == root
+    
+    def verify_token_merkle(self, node_id: str, root: Optional[str] = None) -> Tuple[bool, List[str]]:
+        """Check token inclusion in the Merkle tree (O(log N) hashes, no chain walk)
+        
+        This is an inclusion check only, not an authenticity check: without a
+        root the tree is built from this network's own tokens, so any token in
+        the dict is included, signed or not. Use verify_token or
+        verify_token_direct_master to establish trust; pass a root obtained
+        from a trusted source to check membership in that snapshot.
+        
+        Without an explicit root the proof is only replayed up to the cached
+        mid-tree layer, which halves the hashes per verification.
+        """
+        if node_id not in self.tokens:
+            return False, [f"Token for node {node_id} not found"]
+        
+        token_hash = self.tokens[node_id].token_hash
+        if root is None:
+            level = self._merkle_cached_level()
+            if node_id not in self._merkle_index:
+                return False, ["Token not in Merkle tree"]
+            proof = self.get_merkle_proof(node_id, level)
+            current = self._replay_merkle_proof(token_hash, proof)
+            is_valid = current == self._merkle_layers[level][self._merkle_index[node_id] >> level]
+        else:
+            proof = self.get_merkle_proof(node_id)
+            is_valid = self.verify_merkle_proof(token_hash, proof, root)
+        
+        if is_valid:
+            return True, [f"Merkle inclusion proof matched for {node_id} ({len(proof)} hashes)"]
+        else:
+            return False, ["Merkle inclusion proof did not match"]
+    
+    def verify_token_hybrid_fast(self, node_id: str) -> Tuple[bool, Dict[str, Tuple[bool, List[str]]]]:
+        """Like verify_token_hybrid, but stop at the first method that succeeds
+        
+        Methods are tried cheapest first: master-direct (one signature check),
+        then the chain walk, then issuer-direct. The results only hold the
+        methods that were tried, so the last entry is the one that decided.
+        """
+        results = {}
+        token = self.tokens.get(node_id)
+        
+        if token is not None and "master-direct" in token.verification_paths:
+            results["master-direct"] = self.verify_token_direct_master(node_id)
+            if results["master-direct"][0]:
+                return True, results
+        
+        results["chain"] = self.verify_token(node_id)
+        if results["chain"][0]:
+            return True, results
+        
+        if token is not None and token.issuer_id and token.issuer_id in self.tokens:
+            results["issuer-direct"] = self._verify_direct_issuer(token.issuer_id, token)
+            if results["issuer-direct"][0]:
+                return True, results
+        
+        return False, results
+    
+    def get_descendants(self, node_id: str) -> List[str]:
+        """List every node issued directly or indirectly by node_id"""
+        descendants = []
+        seen = {node_id}  # tampered stores can contain issuer cycles
+        pending = [node_id]
+        while pending:
+            parent = pending.pop()
+            for child in self._children.get(parent, ()):
+                # Skip ids deleted or re-issued in the tokens dict since they were indexed
+                token = self.tokens.get(child)
+                if token is None or token.issuer_id != parent:
+                    continue
+                if child not in seen:
+                    seen.add(child)
+                    descendants.append(child)
+                    pending.append(child)
+        return descendants
+    
+    def get_tokens_by_level(self) -> Dict[int, List[SecureToken]]:
+        """Tokens grouped by hierarchy level, in ascending level order"""
+        by_level = {}
+        for level in sorted(self._levels):
+            # Skip ids deleted or replaced in the tokens dict since they were indexed
+            tokens = [token for token in map(self.tokens.get, self._levels[level])
+                      if token is not None and token.hierarchy_level == level]
+            if tokens:
+                by_level[level] = tokens
+        return by_level
+    
     def get_token_info(self, node_id: str) -> Optional[Dict]:
         if node_id in self.tokens:
             return self.tokens[node_id].to_dict()
@@ -1,45 +1,64 @@
 #!/usr/bin/env python3
 
+import io
 import os
 import json
-import tempfile
-from .core import PKITokenNetwork
-from cryptography.hazmat.primitives import serialization
+import shutil
+import tarfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+from .core import PKITokenNetwork, load_public_key
 
-def create_secure_token_package(network: PKITokenNetwork, node_id: str, output_dir: str):
-    """Create a secure token package for distribution to a node"""
-    
-    if node_id not in network.tokens:
-        raise ValueError(f"Token for {node_id} not found")
-    
+try:
+    import orjson  # optional, install with the "fast" extra
+except ImportError:
+    orjson = None
+
+# Thread count for writing packages in create_packages_bulk()
+_PACKAGE_WORKERS = 8
+
+# README.json text shared by every package
+_README_INSTRUCTIONS = (
+    "1. Generate your own key pair locally (never share private key)",
+    "2. Use the certificate file for identity verification",
+    "3. Use public keys to verify signatures in the certificate",
+    "4. The private key corresponding to this certificate is NOT included for security",
+    "5. To issue tokens to others, use your locally generated private key"
+)
+_README_SECURITY_NOTES = (
+    "⚠️  Private keys are never distributed",
+    "✅ Generate your own key pair on your secure system",
+    "✅ Verify certificate signatures using provided public keys",
+    "✅ Store your private key securely (encrypted storage recommended)"
+)
+
+
+def _json_dumps_pretty(obj) -> bytes:
+    """Serialize to indented JSON bytes for files people read, via orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
+
+def _package_members(network: PKITokenNetwork, node_id: str) -> Tuple[List[Tuple[str, bytes]], Dict]:
+    """Build the (filename, contents) pairs of a node's secure package, plus its instructions"""
     token = network.tokens[node_id]
-    os.makedirs(output_dir, exist_ok=True)
+    members = []
     
     # 1. Token/Certificate file (contains all verification data)
-    token_file = os.path.join(output_dir, f"{node_id}_certificate.json")
-    with open(token_file, 'w') as f:
-        json.dump(token.to_dict(), f, indent=2)
+    token_dict = token.to_dict()
+    members.append((f"{node_id}_certificate.json", _json_dumps_pretty(token_dict)))
     
     # 2. Master public key (for master signature verification)
     if network.master_public_key:
-        master_pub_pem = network.master_public_key.public_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PublicFormat.SubjectPublicKeyInfo
-        )
-        master_pub_file = os.path.join(output_dir, "master_public_key.pem")
-        with open(master_pub_file, 'wb') as f:
-            f.write(master_pub_pem)
+        master_pub_pem = network.public_key_pem(network.master_public_key)
+        members.append(("master_public_key.pem", master_pub_pem))
     
     # 3. Issuer public key (for issuer signature verification)
     if token.issuer_id and token.issuer_id in network.node_keys:
         _, issuer_public_key = network.node_keys[token.issuer_id]
-        issuer_pub_pem = issuer_public_key.public_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PublicFormat.SubjectPublicKeyInfo
-        )
-        issuer_pub_file = os.path.join(output_dir, f"{token.issuer_id}_public_key.pem")
-        with open(issuer_pub_file, 'wb') as f:
-            f.write(issuer_pub_pem)
+        issuer_pub_pem = network.public_key_pem(issuer_public_key)
+        members.append((f"{token.issuer_id}_public_key.pem", issuer_pub_pem))
     
     # 4. Verification instructions
     instructions = {
@@ -47,25 +66,68 @@ def create_secure_token_package(network: PKITokenNetwork, node_id: str, output_d
         "certificate_file": f"{node_id}_certificate.json",
         "master_public_key": "master_public_key.pem",
         "issuer_public_key": f"{token.issuer_id}_public_key.pem" if token.issuer_id else None,
-        "verification_methods": list(token.verification_paths),
-        "instructions": [
-            "1. Generate your own RSA key pair locally (never share private key)",
-            "2. Use the certificate file for identity verification",
-            "3. Use public keys to verify signatures in the certificate",
-            "4. The private key corresponding to this certificate is NOT included for security",
-            "5. To issue tokens to others, use your locally generated private key"
-        ],
-        "security_notes": [
-            "⚠️  Private keys are never distributed",
-            "✅ Generate your own key pair on your secure system",
-            "✅ Verify certificate signatures using provided public keys",
-            "✅ Store your private key securely (encrypted storage recommended)"
-        ]
+        "verification_methods": token_dict['verification_paths'],  # sorted
+        # Fresh lists: callers get this dict back and may modify it
+        "instructions": list(_README_INSTRUCTIONS),
+        "security_notes": list(_README_SECURITY_NOTES)
     }
+    members.append(("README.json", _json_dumps_pretty(instructions)))
+    return members, instructions
+
+def create_secure_token_package(network: PKITokenNetwork, node_id: str, output_dir: str,
+                                archive: bool = False) -> Dict:
+    """Create a secure token package for distribution to a node
     
-    instructions_file = os.path.join(output_dir, "README.json")
-    with open(instructions_file, 'w') as f:
-        json.dump(instructions, f, indent=2)
+    With archive=True the package is written as a single
+    {node_id}_package.tar in output_dir instead of as separate files.
+    Returns the instructions written to README.json.
+    """
+    
+    if node_id not in network.tokens:
+        raise ValueError(f"Token for {node_id} not found")
+    
+    members, instructions = _package_members(network, node_id)
+    _write_package(node_id, output_dir, members, archive)
+    return instructions
+
+def _write_package(node_id: str, output_dir: str, members: List[Tuple[str, bytes]], archive: bool):
+    """Write package members as separate files, or as one tar when archive is set"""
+    os.makedirs(output_dir, exist_ok=True)
+    
+    if archive:
+        archive_file = os.path.join(output_dir, f"{node_id}_package.tar")
+        now = time.time()
+        with tarfile.open(archive_file, "w") as tar:
+            for name, data in members:
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                info.mtime = now
+                info.mode = 0o644
+                tar.addfile(info, io.BytesIO(data))
+    else:
+        # Each member is written whole, so skip the BufferedWriter layer
+        for name, data in members:
+            with open(os.path.join(output_dir, name), 'wb', buffering=0) as f:
+                f.write(data)
+
+def create_packages_bulk(network: PKITokenNetwork, node_ids: List[str], output_root: str,
+                         archive: bool = False) -> Dict[str, str]:
+    """Create secure packages for several nodes, as output_root/{node_id}_secure_package
+    
+    Package contents are built up front in this thread; the file writes
+    then run in a thread pool. Returns node_id -> package directory.
+    """
+    jobs = []
+    for node_id in node_ids:
+        if node_id not in network.tokens:
+            raise ValueError(f"Token for {node_id} not found")
+        output_dir = os.path.join(output_root, f"{node_id}_secure_package")
+        members, _ = _package_members(network, node_id)
+        jobs.append((node_id, output_dir, members, archive))
+    
+    with ThreadPoolExecutor(max_workers=_PACKAGE_WORKERS) as pool:
+        list(pool.map(lambda job: _write_package(*job), jobs))
+    return {node_id: output_dir for node_id, output_dir, _, _ in jobs}
 
 def demonstrate_secure_distribution():
     """Demonstrate secure token distribution vs current insecure method"""
@@ -76,9 +138,7 @@ def demonstrate_secure_distribution():
     
     # Setup
     demo_dir = "demo_secure_dist"
-    if os.path.exists(demo_dir):
-        import shutil
-        shutil.rmtree(demo_dir)
+    shutil.rmtree(demo_dir, ignore_errors=True)
     
     network = PKITokenNetwork(demo_dir)
     
@@ -91,14 +151,16 @@ def demonstrate_secure_distribution():
     # Current insecure method
     print("\n❌ CURRENT INSECURE DISTRIBUTION:")
     print("Files created for client-system:")
-    client_files = [f for f in os.listdir(demo_dir) if "client-system" in f]
+    with os.scandir(demo_dir) as entries:
+        client_files = [e.name for e in entries if "client-system" in e.name]
     for file in client_files:
         print(f"  📄 {file}")
     
     # Check for private key
     keys_dir = os.path.join(demo_dir, "keys")
     if os.path.exists(keys_dir):
-        key_files = [f for f in os.listdir(keys_dir) if "client-system" in f]
+        with os.scandir(keys_dir) as entries:
+            key_files = [e.name for e in entries if "client-system" in e.name]
         for file in key_files:
             if "private" in file:
                 print(f"  🚨 {file} (SECURITY RISK - private key distributed!)")
@@ -108,17 +170,14 @@ def demonstrate_secure_distribution():
     # Secure distribution
     print("\n✅ SECURE DISTRIBUTION METHOD:")
     secure_package_dir = "client_secure_package"
-    create_secure_token_package(network, "client-system", secure_package_dir)
+    instructions = create_secure_token_package(network, "client-system", secure_package_dir)
     
     print("Secure package contents:")
     for file in os.listdir(secure_package_dir):
         print(f"  📦 {file}")
     
-    # Show package contents
+    # Show package contents (the same instructions written to README.json)
     print("\n📋 SECURITY INSTRUCTIONS FOR CLIENT:")
-    with open(os.path.join(secure_package_dir, "README.json"), 'r') as f:
-        instructions = json.load(f)
-    
     for instruction in instructions["instructions"]:
         print(f"  {instruction}")
     
@@ -137,10 +196,8 @@ def demonstrate_secure_distribution():
     print("\n✅ VERIFICATION TEST (using only distributed public keys):")
     
     # Load public keys from secure package
-    from cryptography.hazmat.primitives.serialization import load_pem_public_key
-    
     with open(os.path.join(secure_package_dir, "master_public_key.pem"), 'rb') as f:
-        master_pub_key = load_pem_public_key(f.read())
+        master_pub_key = load_public_key(f.read())
     
     # Verify master signature
     client_token = network.tokens["client-system"]
@@ -148,7 +205,6 @@ def demonstrate_secure_distribution():
     print(f"  Master signature verification: {'✅ VALID' if can_verify_master else '❌ INVALID'}")
     
     # Cleanup
-    import shutil
     shutil.rmtree(demo_dir)
     shutil.rmtree(secure_package_dir)
     
@@ -1,15 +1,19 @@
 #!/usr/bin/env python3
 
-def analyze_current_vs_blockchain():
-    print("=" * 80)
-    print("CURRENT SYSTEM vs TRUE BLOCKCHAIN ANALYSIS")
-    print("=" * 80)
+import sys
+
+def _build_report() -> str:
+    """The analysis text; it never changes, so it is built once at import"""
+    out = []
+    out.append("=" * 80)
+    out.append("CURRENT SYSTEM vs TRUE BLOCKCHAIN ANALYSIS")
+    out.append("=" * 80)
     
-    print("\n🔍 WHAT YOU CURRENTLY HAVE:")
-    print("-" * 50)
+    out.append("\n🔍 WHAT YOU CURRENTLY HAVE:")
+    out.append("-" * 50)
     current_features = [
         "✅ Cryptographic hashing (SHA256)",
-        "✅ Digital signatures (RSA)",
+        "✅ Digital signatures (Ed25519)",
         "✅ Hash chains (token→issuer→master)",  
         "✅ Tamper detection",
         "✅ Hierarchical trust model",
@@ -23,10 +27,10 @@ def analyze_current_vs_blockchain():
     ]
     
     for feature in current_features:
-        print(f"  {feature}")
+        out.append(f"  {feature}")
     
-    print("\n🔗 MISSING BLOCKCHAIN COMPONENTS:")
-    print("-" * 50)
+    out.append("\n🔗 MISSING BLOCKCHAIN COMPONENTS:")
+    out.append("-" * 50)
     missing_components = [
         "1. BLOCKS: Transactions grouped into blocks with headers",
         "2. CHAIN: Blocks linked with previous block hashes", 
@@ -39,13 +43,13 @@ def analyze_current_vs_blockchain():
     ]
     
     for component in missing_components:
-        print(f"  {component}")
+        out.append(f"  {component}")
     
-    print("\n📊 ARCHITECTURE COMPARISON:")
-    print("-" * 50)
+    out.append("\n📊 ARCHITECTURE COMPARISON:")
+    out.append("-" * 50)
     
-    print("CURRENT SYSTEM (Hierarchical PKI):")
-    print("""
+    out.append("CURRENT SYSTEM (Hierarchical PKI):")
+    out.append("""
     Master Token
     ├── Regional Office A
     │   ├── Department A1  
@@ -58,8 +62,8 @@ def analyze_current_vs_blockchain():
     Trust: Hierarchical (top-down)
     """)
     
-    print("TRUE BLOCKCHAIN:")
-    print("""
+    out.append("TRUE BLOCKCHAIN:")
+    out.append("""
     Genesis Block ← Block 1 ← Block 2 ← Block 3
     ├─ Tx: Alice→Bob    ├─ Tx: Bob→Carol
     ├─ Tx: Carol→Dave   ├─ Tx: Dave→Eve  
@@ -70,8 +74,8 @@ def analyze_current_vs_blockchain():
     Trust: Decentralized (peer verification)
     """)
     
-    print("\n🎯 WHAT YOU NEED FOR TRUE BLOCKCHAIN:")
-    print("-" * 50)
+    out.append("\n🎯 WHAT YOU NEED FOR TRUE BLOCKCHAIN:")
+    out.append("-" * 50)
     blockchain_requirements = [
         "1. Replace hierarchical structure with blockchain",
         "2. Implement block creation and linking",
@@ -84,20 +88,27 @@ def analyze_current_vs_blockchain():
     ]
     
     for req in blockchain_requirements:
-        print(f"  {req}")
+        out.append(f"  {req}")
+    
+    out.append("\n💡 SYSTEM CLASSIFICATION:")
+    out.append("-" * 50)
+    out.append("Your current system is:")
+    out.append("  🏢 Distributed PKI with Cryptographic Signatures")
+    out.append("  🔗 Hash Chain Authentication System")  
+    out.append("  🛡️  Hierarchical Certificate Authority")
+    out.append("")
+    out.append("NOT a blockchain because it lacks:")
+    out.append("  ❌ Decentralized consensus")
+    out.append("  ❌ Block-based data structure") 
+    out.append("  ❌ Peer-to-peer network")
+    out.append("  ❌ Mining/validation mechanism")
     
-    print("\n💡 SYSTEM CLASSIFICATION:")
-    print("-" * 50)
-    print("Your current system is:")
-    print("  🏢 Distributed PKI with Cryptographic Signatures")
-    print("  🔗 Hash Chain Authentication System")  
-    print("  🛡️  Hierarchical Certificate Authority")
-    print()
-    print("NOT a blockchain because it lacks:")
-    print("  ❌ Decentralized consensus")
-    print("  ❌ Block-based data structure") 
-    print("  ❌ Peer-to-peer network")
-    print("  ❌ Mining/validation mechanism")
+    return "\n".join(out) + "\n"
+
+_REPORT = _build_report()
+
+def analyze_current_vs_blockchain():
+    sys.stdout.write(_REPORT)
 
 if __name__ == "__main__":
     analyze_current_vs_blockchain()
\ No newline at end of file
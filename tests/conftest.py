@@ -0,0 +1,16 @@
+import os
+import tempfile
+
+# Keep the suite's key and token files in RAM on Linux; every test creates
+# its directory with tempfile.mkdtemp(), which honours tempfile.tempdir
+if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+    tempfile.tempdir = "/dev/shm"
+
+def pytest_addoption(parser):
+    parser.addoption("--fast", action="store_true",
+                     help="skip tests that only exercise storage I/O")
+
+def pytest_configure(config):
+    # Exported before collection so unittest skipIf decorators can see it
+    if config.getoption("--fast"):
+        os.environ["PKI_FAST_TESTS"] = "1"
@@ -3,17 +3,48 @@
 import unittest
 import sys
 import os
+import tempfile
+from collections import Counter
+
+try:
+    from concurrencytest import ConcurrentTestSuite, fork_for_tests  # optional
+except ImportError:
+    ConcurrentTestSuite = None
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-def run_all_tests():
+# Same as conftest.py: keep test directories on tmpfs when it is available
+if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+    tempfile.tempdir = "/dev/shm"
+
+def discover_tests() -> unittest.TestSuite:
+    """Discover every test module once; the suite is shared by listing and running"""
+    loader = unittest.TestLoader()
+    start_dir = os.path.dirname(os.path.abspath(__file__))
+    return loader.discover(start_dir, pattern='test_*.py')
+
+def _iter_tests(suite):
+    """Yield the individual test cases in a (nested) suite"""
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            yield from _iter_tests(test)
+        else:
+            yield test
+
+def run_all_tests(suite=None):
     """Run all test suites and generate comprehensive coverage report"""
     
     # Discover and run all tests
-    loader = unittest.TestLoader()
-    start_dir = os.path.dirname(os.path.abspath(__file__))
-    suite = loader.discover(start_dir, pattern='test_*.py')
+    if suite is None:
+        suite = discover_tests()
+    
+    # Fan tests out to one forked worker per core when concurrencytest is
+    # installed; every test works in its own temporary directory
+    workers = os.cpu_count() or 1
+    if ConcurrentTestSuite is not None and workers > 1:
+        print(f"Running tests in {workers} parallel workers")
+        suite = ConcurrentTestSuite(suite, fork_for_tests(workers))
     
     # Run tests with detailed output
     runner = unittest.TextTestRunner(verbosity=2, buffer=True)
@@ -48,7 +79,7 @@ def run_all_tests():
     
     return result.wasSuccessful()
 
-def list_test_modules():
+def list_test_modules(suite=None):
     """List all test modules and their test counts"""
     print("Test Modules and Coverage:")
     print("-" * 50)
@@ -60,15 +91,18 @@ def list_test_modules():
         ('test_cli.py', 'Command line interface tests'),
         ('test_persistence.py', 'Data persistence and storage tests'),
         ('test_security.py', 'Security and tamper detection tests'),
+        ('test_token_packager.py', 'Secure distribution package tests'),
     ]
     
+    # Count tests per module from the already-loaded suite
+    if suite is None:
+        suite = discover_tests()
+    counts = Counter(type(test).__module__ for test in _iter_tests(suite))
+    
     total_tests = 0
     for module, description in test_modules:
-        if os.path.exists(module):
-            # Count tests in module
-            loader = unittest.TestLoader()
-            suite = loader.loadTestsFromName(module[:-3])  # Remove .py extension
-            test_count = suite.countTestCases()
+        if module[:-3] in counts:  # Remove .py extension
+            test_count = counts[module[:-3]]
             total_tests += test_count
             print(f"{module:25} {test_count:3d} tests - {description}")
         else:
@@ -82,9 +116,10 @@ if __name__ == '__main__':
     print("PKI Token Network - Comprehensive Test Suite")
     print("=" * 70)
     
-    list_test_modules()
+    suite = discover_tests()
+    list_test_modules(suite)
     
-    success = run_all_tests()
+    success = run_all_tests(suite)
     
     if success:
         print("\n✅ TDD Implementation Complete - All Tests Pass!")
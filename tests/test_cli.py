@@ -4,20 +4,30 @@ import unittest
 import sys
 import os
 import tempfile
-import shutil
 import subprocess
 import json
+from contextlib import redirect_stdout, redirect_stderr
 from io import StringIO
-from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import patch
 
 # Add the parent directory to Python path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import importlib.util
+
+def _load_cli(path):
+    """Load pki-cli.py once per process; later imports reuse sys.modules"""
+    module = sys.modules.get("pki_cli")
+    if module is None:
+        spec = importlib.util.spec_from_file_location("pki_cli", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        sys.modules["pki_cli"] = module
+    return module
+
 cli_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pki-cli.py")
-spec = importlib.util.spec_from_file_location("pki_cli", cli_path)
-cli = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(cli)
+cli = _load_cli(cli_path)
 from pki_network import PKITokenNetwork
 
 class TestCLIFunctions(unittest.TestCase):
@@ -25,22 +35,15 @@ class TestCLIFunctions(unittest.TestCase):
     
     def setUp(self):
         """Set up test environment"""
-        self.test_dir = tempfile.mkdtemp()
-        self.original_argv = sys.argv.copy()
-    
-    def tearDown(self):
-        """Clean up test environment"""
-        if os.path.exists(self.test_dir):
-            shutil.rmtree(self.test_dir)
-        sys.argv = self.original_argv
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.test_dir = tmp.name
     
     def test_create_master_success(self):
         """Test create_master function with valid input"""
-        args = MagicMock()
-        args.storage_dir = self.test_dir
-        args.node_id = "test-master"
+        args = SimpleNamespace(storage_dir=self.test_dir, node_id="test-master")
         
-        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+        with redirect_stdout(StringIO()) as mock_stdout:
             cli.create_master(args)
             output = mock_stdout.getvalue()
             
@@ -58,11 +61,9 @@ class TestCLIFunctions(unittest.TestCase):
         network = PKITokenNetwork(self.test_dir)
         network.create_master_token("existing-master")
         
-        args = MagicMock()
-        args.storage_dir = self.test_dir
-        args.node_id = "new-master"
+        args = SimpleNamespace(storage_dir=self.test_dir, node_id="new-master")
         
-        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+        with redirect_stdout(StringIO()) as mock_stdout:
             with self.assertRaises(SystemExit) as context:
                 cli.create_master(args)
         
@@ -74,13 +75,9 @@ class TestCLIFunctions(unittest.TestCase):
         network = PKITokenNetwork(self.test_dir)
         network.create_master_token("master")
         
-        args = MagicMock()
-        args.storage_dir = self.test_dir
-        args.issuer = "master"
-        args.node_id = "child-node"
-        args.data = "test data"
+        args = SimpleNamespace(storage_dir=self.test_dir, issuer="master", node_id="child-node", data="test data")
         
-        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+        with redirect_stdout(StringIO()) as mock_stdout:
             cli.issue_token(args)
             output = mock_stdout.getvalue()
         
@@ -94,13 +91,9 @@ class TestCLIFunctions(unittest.TestCase):
     
     def test_issue_token_invalid_issuer(self):
         """Test issue_token function with invalid issuer"""
-        args = MagicMock()
-        args.storage_dir = self.test_dir
-        args.issuer = "nonexistent"
-        args.node_id = "child"
-        args.data = None
+        args = SimpleNamespace(storage_dir=self.test_dir, issuer="nonexistent", node_id="child", data=None)
         
-        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+        with redirect_stdout(StringIO()) as mock_stdout:
             with self.assertRaises(SystemExit) as context:
                 cli.issue_token(args)
         
@@ -113,11 +106,9 @@ class TestCLIFunctions(unittest.TestCase):
         network.create_master_token("master")
         network.issue_token("master", "child")
         
-        args = MagicMock()
-        args.storage_dir = self.test_dir
-        args.node_id = "child"
+        args = SimpleNamespace(storage_dir=self.test_dir, node_id="child")
         
-        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+        with redirect_stdout(StringIO()) as mock_stdout:
             cli.verify_token(args)
             output = mock_stdout.getvalue()
         
@@ -130,11 +121,9 @@ class TestCLIFunctions(unittest.TestCase):
         network = PKITokenNetwork(self.test_dir)
         network.create_master_token("master")
         
-        args = MagicMock()
-        args.storage_dir = self.test_dir
-        args.node_id = "nonexistent"
+        args = SimpleNamespace(storage_dir=self.test_dir, node_id="nonexistent")
         
-        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+        with redirect_stdout(StringIO()) as mock_stdout:
             cli.verify_token(args)
             output = mock_stdout.getvalue()
         
@@ -145,11 +134,9 @@ class TestCLIFunctions(unittest.TestCase):
         network = PKITokenNetwork(self.test_dir)
         network.create_master_token("master")
         
-        args = MagicMock()
-        args.storage_dir = self.test_dir
-        args.node_id = "master"
+        args = SimpleNamespace(storage_dir=self.test_dir, node_id="master")
         
-        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+        with redirect_stdout(StringIO()) as mock_stdout:
             cli.show_token(args)
             output = mock_stdout.getvalue()
         
@@ -158,11 +145,9 @@ class TestCLIFunctions(unittest.TestCase):
     
     def test_show_token_nonexistent(self):
         """Test show_token function with non-existent token"""
-        args = MagicMock()
-        args.storage_dir = self.test_dir
-        args.node_id = "nonexistent"
+        args = SimpleNamespace(storage_dir=self.test_dir, node_id="nonexistent")
         
-        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+        with redirect_stdout(StringIO()) as mock_stdout:
             with self.assertRaises(SystemExit) as context:
                 cli.show_token(args)
         
@@ -170,10 +155,9 @@ class TestCLIFunctions(unittest.TestCase):
     
     def test_list_tokens_empty(self):
         """Test list_tokens function with empty network"""
-        args = MagicMock()
-        args.storage_dir = self.test_dir
+        args = SimpleNamespace(storage_dir=self.test_dir)
         
-        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+        with redirect_stdout(StringIO()) as mock_stdout:
             cli.list_tokens(args)
             output = mock_stdout.getvalue()
         
@@ -186,10 +170,9 @@ class TestCLIFunctions(unittest.TestCase):
         network.issue_token("master", "child1")
         network.issue_token("master", "child2")
         
-        args = MagicMock()
-        args.storage_dir = self.test_dir
+        args = SimpleNamespace(storage_dir=self.test_dir)
         
-        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+        with redirect_stdout(StringIO()) as mock_stdout:
             cli.list_tokens(args)
             output = mock_stdout.getvalue()
         
@@ -203,19 +186,35 @@ class TestCLICommandLine(unittest.TestCase):
     
     def setUp(self):
         """Set up test environment"""
-        self.test_dir = tempfile.mkdtemp()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.test_dir = tmp.name
         self.cli_script = "pki-cli.py"
     
-    def tearDown(self):
-        """Clean up test environment"""
-        if os.path.exists(self.test_dir):
-            shutil.rmtree(self.test_dir)
+    def run_cli_command(self, args, storage_dir=None, input=""):
+        """Helper to run CLI commands in-process, shaped like subprocess.run()"""
+        argv = [self.cli_script, "--storage-dir", storage_dir or self.test_dir] + args
+        returncode = 0
+        with patch('sys.stdin', StringIO(input)), \
+             redirect_stdout(StringIO()) as stdout, \
+             redirect_stderr(StringIO()) as stderr:
+            try:
+                cli.main(argv[1:])
+            except SystemExit as e:
+                if isinstance(e.code, int):
+                    returncode = e.code
+                elif e.code is not None:
+                    returncode = 1
+        return subprocess.CompletedProcess(argv, returncode, stdout.getvalue(), stderr.getvalue())
     
-    def run_cli_command(self, args):
-        """Helper to run CLI commands"""
-        cmd = ["python3", self.cli_script, "--storage-dir", self.test_dir] + args
-        result = subprocess.run(cmd, capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
-        return result
+    def _setup_cli(self, args, input=""):
+        """Run an arrange-step CLI command whose output is not asserted; it must succeed"""
+        result = self.run_cli_command(args, input=input)
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+    
+    def _setup_bulk(self, operations):
+        """Arrange several tokens with a single 'bulk' CLI run"""
+        self._setup_cli(["bulk", "--from-json", "-"], input=json.dumps(operations))
     
     def test_cli_help(self):
         """Test CLI help command"""
@@ -235,7 +234,7 @@ class TestCLICommandLine(unittest.TestCase):
     def test_cli_issue_token(self):
         """Test CLI issue command"""
         # First create master
-        self.run_cli_command(["create-master", "master"])
+        self._setup_cli(["create-master", "master"])
         
         # Then issue token
         result = self.run_cli_command(["issue", "master", "child", "--data", "child data"])
@@ -245,17 +244,24 @@ class TestCLICommandLine(unittest.TestCase):
     def test_cli_verify_token(self):
         """Test CLI verify command"""
         # Setup tokens
-        self.run_cli_command(["create-master", "master"])
-        self.run_cli_command(["issue", "master", "child"])
+        self._setup_bulk([{"op": "create-master", "node_id": "master"},
+                          {"op": "issue", "issuer": "master", "node_id": "child"}])
+        
+        # Expected chain, built from the stored hashes without verifying
+        tokens = PKITokenNetwork(self.test_dir).tokens
+        expected_chain = "".join(
+            f"  {i}. {node_id} -> {tokens[node_id].token_hash[:16]}...\n"
+            for i, node_id in enumerate(["child", "master"], 1))
         
         # Verify token
         result = self.run_cli_command(["verify", "child"])
         self.assertEqual(result.returncode, 0)
         self.assertIn("Status: VALID", result.stdout)
+        self.assertTrue(result.stdout.endswith("Verification chain:\n" + expected_chain), result.stdout)
     
     def test_cli_show_token(self):
         """Test CLI show command"""
-        self.run_cli_command(["create-master", "master"])
+        self._setup_cli(["create-master", "master"])
         
         result = self.run_cli_command(["show", "master"])
         self.assertEqual(result.returncode, 0)
@@ -263,14 +269,46 @@ class TestCLICommandLine(unittest.TestCase):
     
     def test_cli_list_tokens(self):
         """Test CLI list command"""
-        self.run_cli_command(["create-master", "master"])
-        self.run_cli_command(["issue", "master", "child1"])
-        self.run_cli_command(["issue", "master", "child2"])
+        self._setup_bulk([{"op": "create-master", "node_id": "master"},
+                          {"op": "issue", "issuer": "master", "node_id": "child1"},
+                          {"op": "issue", "issuer": "master", "node_id": "child2"}])
         
         result = self.run_cli_command(["list"])
         self.assertEqual(result.returncode, 0)
         self.assertIn("Found 3 tokens in the network", result.stdout)
     
+    def test_cli_bulk(self):
+        """Test CLI bulk command applies operations from a file and stops at errors"""
+        ops_file = os.path.join(self.test_dir, "ops.json")
+        with open(ops_file, 'w') as f:
+            json.dump([{"op": "create-master", "node_id": "master"},
+                       {"op": "issue", "issuer": "master", "node_id": "child", "data": "child data"},
+                       {"op": "revoke", "node_id": "child"}], f)
+        
+        result = self.run_cli_command(["bulk", "--from-json", ops_file])
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("Token issued to node: child", result.stdout)
+        self.assertIn("Error: Unknown operation: revoke", result.stdout)
+        
+        network = PKITokenNetwork(self.test_dir)
+        self.assertEqual(network.tokens["child"].token_data, "child data")
+    
+    def test_cli_bulk_invalid_input(self):
+        """Test CLI bulk command reports unreadable or malformed input as errors"""
+        missing = os.path.join(self.test_dir, "missing.json")
+        cases = {
+            "missing file": (["--from-json", missing], ""),
+            "malformed json": (["--from-json", "-"], "[{"),
+            "top-level object": (["--from-json", "-"], '{"op": "create-master"}'),
+            "non-object entry": (["--from-json", "-"], '["create-master"]'),
+        }
+        for name, (args, stdin) in cases.items():
+            with self.subTest(name):
+                result = self.run_cli_command(["bulk"] + args, input=stdin)
+                self.assertEqual(result.returncode, 1)
+                self.assertTrue(result.stdout.startswith("Error: "), result.stdout)
+        self.assertEqual(PKITokenNetwork(self.test_dir).tokens, {})
+    
     def test_cli_error_handling(self):
         """Test CLI error handling"""
         # Try to issue without master
@@ -285,15 +323,11 @@ class TestCLICommandLine(unittest.TestCase):
     
     def test_cli_custom_storage_dir(self):
         """Test CLI with custom storage directory"""
-        custom_dir = tempfile.mkdtemp()
-        try:
-            cmd = ["python3", self.cli_script, "--storage-dir", custom_dir, "create-master", "test"]
-            result = subprocess.run(cmd, capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        with tempfile.TemporaryDirectory() as custom_dir:
+            result = self.run_cli_command(["create-master", "test"], storage_dir=custom_dir)
             
             self.assertEqual(result.returncode, 0)
             self.assertTrue(os.path.exists(os.path.join(custom_dir, "test_token.json")))
-        finally:
-            shutil.rmtree(custom_dir)
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,127 +1,78 @@
 #!/usr/bin/env python3
 
-import os
 import shutil
+import pytest
+from pathlib import Path
 from pki_network import PKITokenNetwork
 
-def test_pki_network():
-    test_dir = "test_tokens"
-    
-    # Clean up any existing test directory
-    if os.path.exists(test_dir):
-        shutil.rmtree(test_dir)
-    
-    print("=== PKI Token Network Test ===\n")
-    
-    # Initialize network
+# node_id -> (issuer_id, expected chain length)
+HIERARCHY = {
+    "master-node": (None, 1),
+    "node-a": ("master-node", 2),
+    "node-b": ("master-node", 2),
+    "node-a1": ("node-a", 3),
+    "node-a2": ("node-a", 3),
+    "node-b1": ("node-b", 3),
+}
+
+@pytest.fixture(scope="module")
+def network_dir(tmp_path_factory):
+    """Storage directory holding the example hierarchy, built once per module"""
+    test_dir = str(tmp_path_factory.mktemp("test_tokens"))
     network = PKITokenNetwork(test_dir)
-    
-    # Test 1: Create master token
-    print("1. Creating master token...")
-    try:
-        master = network.create_master_token("master-node")
-        print(f"   ✓ Master token created: {master.token_hash[:16]}...")
-    except Exception as e:
-        print(f"   ✗ Error: {e}")
-        return
-    
-    # Test 2: Issue child tokens
-    print("\n2. Issuing child tokens...")
-    try:
-        node_a = network.issue_token("master-node", "node-a", "Node A data")
-        node_b = network.issue_token("master-node", "node-b", "Node B data")
-        print(f"   ✓ Token issued to node-a: {node_a.token_hash[:16]}...")
-        print(f"   ✓ Token issued to node-b: {node_b.token_hash[:16]}...")
-    except Exception as e:
-        print(f"   ✗ Error: {e}")
-        return
-    
-    # Test 3: Issue grandchild tokens
-    print("\n3. Issuing grandchild tokens...")
-    try:
-        node_a1 = network.issue_token("node-a", "node-a1", "Subnode A1")
-        node_a2 = network.issue_token("node-a", "node-a2", "Subnode A2")
-        node_b1 = network.issue_token("node-b", "node-b1", "Subnode B1")
-        print(f"   ✓ Token issued to node-a1: {node_a1.token_hash[:16]}...")
-        print(f"   ✓ Token issued to node-a2: {node_a2.token_hash[:16]}...")
-        print(f"   ✓ Token issued to node-b1: {node_b1.token_hash[:16]}...")
-    except Exception as e:
-        print(f"   ✗ Error: {e}")
-        return
-    
-    # Test 4: Verify tokens
-    print("\n4. Verifying tokens...")
-    test_nodes = ["master-node", "node-a", "node-b", "node-a1", "node-a2", "node-b1"]
-    
-    for node in test_nodes:
-        is_valid, chain = network.verify_token(node)
-        status = "✓ VALID" if is_valid else "✗ INVALID"
-        print(f"   {status}: {node} (chain length: {len(chain)})")
-        if not is_valid:
-            print(f"     Reason: {chain[-1] if chain else 'Unknown'}")
-    
-    # Test 5: Show network structure
-    print("\n5. Network structure:")
-    tokens = network.list_all_tokens()
-    for token in tokens:
-        token_type = "MASTER" if token['issuer_token_hash'] is None else "NODE"
-        issuer_info = f" (issued by {token['issuer_id']})" if token['issuer_id'] else ""
-        print(f"   {token['node_id']}: {token_type}{issuer_info}")
-    
-    # Test 6: Error handling
-    print("\n6. Testing error handling...")
-    
-    # Try to create duplicate master
-    try:
+    network.create_master_token("master-node")
+    for node_id, (issuer_id, _) in HIERARCHY.items():
+        if issuer_id is not None:
+            network.issue_token(issuer_id, node_id, f"{node_id} data")
+    return test_dir
+
+def test_create_master(network_dir):
+    network = PKITokenNetwork(network_dir)
+    assert network.master_token.node_id == "master-node"
+    assert network.master_token.issuer_token_hash is None
+
+def test_issue_children(network_dir):
+    network = PKITokenNetwork(network_dir)
+    tokens = {token['node_id']: token for token in network.list_all_tokens()}
+    assert set(tokens) == set(HIERARCHY)
+    for node_id, (issuer_id, _) in HIERARCHY.items():
+        assert tokens[node_id]['issuer_id'] == issuer_id
+        if issuer_id is not None:
+            assert tokens[node_id]['issuer_token_hash'] == tokens[issuer_id]['token_hash']
+
+def test_verify_chain(network_dir):
+    # A fresh instance also checks that the hierarchy persisted
+    network = PKITokenNetwork(network_dir)
+    for node_id, (_, chain_length) in HIERARCHY.items():
+        is_valid, chain = network.verify_token(node_id)
+        assert is_valid, chain
+        assert len(chain) == chain_length
+
+@pytest.mark.parametrize("issuer_id, node_id", [
+    ("master-node", "node-a"),       # duplicate node
+    ("non-existent", "new-node"),    # non-existent issuer
+])
+def test_issue_rejected(network_dir, issuer_id, node_id):
+    network = PKITokenNetwork(network_dir)
+    with pytest.raises(ValueError):
+        network.issue_token(issuer_id, node_id, "Invalid")
+
+def test_duplicate_master_rejected(network_dir):
+    network = PKITokenNetwork(network_dir)
+    with pytest.raises(ValueError):
         network.create_master_token("master-node-2")
-        print("   ✗ Should have failed: duplicate master")
-    except ValueError as e:
-        print(f"   ✓ Correctly rejected duplicate master: {e}")
-    
-    # Try to issue to existing node
-    try:
-        network.issue_token("master-node", "node-a", "Duplicate")
-        print("   ✗ Should have failed: duplicate node")
-    except ValueError as e:
-        print(f"   ✓ Correctly rejected duplicate node: {e}")
-    
-    # Try to issue from non-existent node
-    try:
-        network.issue_token("non-existent", "new-node", "Invalid")
-        print("   ✗ Should have failed: non-existent issuer")
-    except ValueError as e:
-        print(f"   ✓ Correctly rejected non-existent issuer: {e}")
-    
-    # Test 7: Simulate hash chain break
-    print("\n7. Testing hash chain integrity...")
-    
-    # Create a new network instance to test persistence
-    network2 = PKITokenNetwork(test_dir)
-    is_valid, chain = network2.verify_token("node-a1")
-    print(f"   ✓ Persistent verification: {'VALID' if is_valid else 'INVALID'}")
-    
-    # Manually corrupt a token file to test integrity
-    token_file = f"{test_dir}/node-a_token.json"
-    if os.path.exists(token_file):
-        with open(token_file, 'r') as f:
-            content = f.read()
-        
-        # Corrupt the token hash
-        corrupted = content.replace(node_a.token_hash, "corrupted_hash_12345")
-        with open(token_file, 'w') as f:
-            f.write(corrupted)
-        
-        # Test with corrupted chain
-        network3 = PKITokenNetwork(test_dir)
-        is_valid, chain = network3.verify_token("node-a1")
-        print(f"   ✓ Corrupted chain detection: {'INVALID' if not is_valid else 'FAILED TO DETECT'}")
-    
-    print("\n=== Test completed ===")
-    
-    # Clean up
-    if os.path.exists(test_dir):
-        shutil.rmtree(test_dir)
-    print("Test directory cleaned up.")
+
+def test_corrupted_chain(network_dir, tmp_path):
+    # Corrupt a copy so the shared hierarchy stays intact for other tests
+    test_dir = str(tmp_path / "corrupted")
+    shutil.copytree(network_dir, test_dir)
+    node_a_hash = PKITokenNetwork(test_dir).tokens["node-a"].token_hash
+
+    token_file = Path(test_dir, "node-a_token.json")
+    token_file.write_bytes(token_file.read_bytes().replace(node_a_hash.encode(), b"corrupted_hash_12345"))
+
+    is_valid, chain = PKITokenNetwork(test_dir).verify_token("node-a1")
+    assert not is_valid
 
 if __name__ == "__main__":
-    test_pki_network()
\ No newline at end of file
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -1,24 +1,18 @@
 #!/usr/bin/env python3
 
 import unittest
-import os
-import tempfile
-import shutil
-import json
 from pki_network import SecureToken, PKITokenNetwork
 
+# Node ids at and just past the 64-character limit
+_ID_64 = "a" * 64
+_ID_65 = "a" * 65
+
 class TestIntegrationFlow(unittest.TestCase):
     """Integration tests for complete token issuance and verification flows"""
     
     def setUp(self):
-        """Set up test environment"""
-        self.test_dir = tempfile.mkdtemp()
-        self.network = PKITokenNetwork(self.test_dir)
-    
-    def tearDown(self):
-        """Clean up test environment"""
-        if os.path.exists(self.test_dir):
-            shutil.rmtree(self.test_dir)
+        """Set up test environment (in memory; nothing here reloads from disk)"""
+        self.network = PKITokenNetwork(None)
     
     def test_complete_three_level_hierarchy(self):
         """Test complete three-level token hierarchy creation and verification"""
@@ -47,14 +41,14 @@ class TestIntegrationFlow(unittest.TestCase):
         tokens_to_verify = ["root-ca", "intermediate-ca-1", "intermediate-ca-2", 
                            "server-1", "server-2", "client-1"]
         
-        for token_id in tokens_to_verify:
-            is_valid, chain = self.network.verify_token(token_id)
-            self.assertTrue(is_valid, f"Token {token_id} should be valid")
-            self.assertIn("root-ca", chain[-1], f"Chain for {token_id} should end with root-ca")
+        results = self.network.verify_all()
+        self.assertEqual(set(results), set(tokens_to_verify))
+        self.assertTrue(all(results.values()), results)
         
         # Verify chain lengths
         is_valid, chain = self.network.verify_token("server-1")
         self.assertEqual(len(chain), 3)  # server-1 -> intermediate-ca-1 -> root-ca
+        self.assertTrue(chain[-1].startswith("root-ca -> "), "Chain should end with root-ca")
         
         is_valid, chain = self.network.verify_token("intermediate-ca-1")
         self.assertEqual(len(chain), 2)  # intermediate-ca-1 -> root-ca
@@ -89,28 +83,16 @@ class TestIntegrationFlow(unittest.TestCase):
         # Create master
         self.network.create_master_token("master")
         
-        # Create 5 first-level children
-        first_level = []
-        for i in range(5):
-            node_id = f"level1-node{i}"
-            self.network.issue_token("master", node_id)
-            first_level.append(node_id)
-        
-        # Create 3 second-level children for each first-level node
-        second_level = []
-        for parent in first_level:
-            for j in range(3):
-                node_id = f"{parent}-child{j}"
-                self.network.issue_token(parent, node_id)
-                second_level.append(node_id)
-        
-        # Create 2 third-level children for each second-level node
-        third_level = []
-        for parent in second_level:
-            for k in range(2):
-                node_id = f"{parent}-leaf{k}"
-                self.network.issue_token(parent, node_id)
-                third_level.append(node_id)
+        # Precompute the hierarchy as (issuer, node) edges, parents first:
+        # 5 first-level children, 3 second-level children for each of them
+        # and 2 third-level children for each second-level node
+        first_level = [f"level1-node{i}" for i in range(5)]
+        second_level = [f"{parent}-child{j}" for parent in first_level for j in range(3)]
+        edges = ([("master", node_id) for node_id in first_level]
+                 + [(parent, f"{parent}-child{j}") for parent in first_level for j in range(3)]
+                 + [(parent, f"{parent}-leaf{k}") for parent in second_level for k in range(2)])
+        
+        self.network.issue_tokens_batch(edges)
         
         # Verify total count: 1 master + 5 level1 + 15 level2 + 30 level3 = 51 tokens
         all_tokens = self.network.list_all_tokens()
@@ -120,10 +102,14 @@ class TestIntegrationFlow(unittest.TestCase):
         test_samples = ["master", "level1-node2", "level1-node3-child1", 
                        "level1-node0-child2-leaf1"]
         
+        # One pass over the whole network for chain validity, then an
+        # O(log N) inclusion proof per sample against the Merkle root
+        self.assertTrue(all(self.network.verify_all().values()))
+        root = self.network.merkle_root()
         for sample in test_samples:
-            is_valid, chain = self.network.verify_token(sample)
-            self.assertTrue(is_valid, f"Token {sample} should be valid")
-            self.assertIn("master", chain[-1])
+            is_valid, result = self.network.verify_token_merkle(sample, root)
+            self.assertTrue(is_valid, f"Token {sample} should be in the network")
+            self.assertLessEqual(len(self.network.get_merkle_proof(sample)), 6)  # ceil(log2(51))
     
     def test_token_issuance_sequence_integrity(self):
         """Test that the sequence of token issuance maintains integrity"""
@@ -163,14 +149,8 @@ class TestErrorConditions(unittest.TestCase):
     """Test various error conditions and edge cases"""
     
     def setUp(self):
-        """Set up test environment"""
-        self.test_dir = tempfile.mkdtemp()
-        self.network = PKITokenNetwork(self.test_dir)
-    
-    def tearDown(self):
-        """Clean up test environment"""
-        if os.path.exists(self.test_dir):
-            shutil.rmtree(self.test_dir)
+        """Set up test environment (in memory; nothing here reloads from disk)"""
+        self.network = PKITokenNetwork(None)
     
     def test_operations_without_master_token(self):
         """Test that operations fail appropriately without master token"""
@@ -186,13 +166,12 @@ class TestErrorConditions(unittest.TestCase):
     def test_boundary_node_id_lengths(self):
         """Test node ID length boundaries"""
         # Test maximum valid length (64 characters)
-        valid_long_id = "a" * 64
-        self.network.create_master_token(valid_long_id)
-        self.assertIn(valid_long_id, self.network.tokens)
+        self.network.create_master_token(_ID_64)
+        self.assertIn(_ID_64, self.network.tokens)
         
         # Test too long (65 characters) - should fail
         with self.assertRaises(ValueError):
-            PKITokenNetwork().create_master_token("a" * 65)
+            PKITokenNetwork(None).create_master_token(_ID_65)
     
     def test_special_characters_in_node_ids(self):
         """Test various special characters in node IDs"""
@@ -200,13 +179,11 @@ class TestErrorConditions(unittest.TestCase):
         invalid_chars = ["node test", "node@test", "node#test", "node/test", "node\\test"]
         
         # Test valid characters
-        for i, node_id in enumerate(valid_chars):
-            network = PKITokenNetwork(tempfile.mkdtemp())
-            try:
-                network.create_master_token(node_id)
-                self.assertIn(node_id, network.tokens)
-            finally:
-                shutil.rmtree(network.storage_dir)
+        for node_id in valid_chars:
+            SecureToken(node_id)  # should not raise
+            network = PKITokenNetwork(None)
+            network.create_master_token(node_id)
+            self.assertIn(node_id, network.tokens)
         
         # Test invalid characters
         for node_id in invalid_chars:
@@ -218,23 +195,35 @@ class TestErrorConditions(unittest.TestCase):
         # Create master
         self.network.create_master_token("master")
         
-        # Rapidly create many tokens
-        token_count = 100
-        for i in range(token_count):
-            if i == 0:
-                parent = "master"
-            else:
-                parent = f"node{i-1}"
+        # Rapidly create many tokens: 10 parents with 9 children each
+        parents = [f"p{p}" for p in range(10)]
+        edges = [(parent, f"{parent}c{c}") for parent in parents for c in range(1, 10)]
+        leaves = [leaf for _, leaf in edges]
+        self.network.issue_tokens_batch([("master", parent) for parent in parents] + edges)
+        self.assertEqual(len(self.network.tokens), 101)  # +1 for master
+        
+        # Verify every leaf chain (long chains are covered by
+        # test_deep_chain_verification)
+        for leaf in leaves:
+            is_valid, chain = self.network.verify_token(leaf)
             
-            self.network.issue_token(parent, f"node{i}")
-        
-        # Verify the chain
-        final_node = f"node{token_count-1}"
-        is_valid, chain = self.network.verify_token(final_node)
-        
-        self.assertTrue(is_valid)
-        self.assertEqual(len(chain), token_count + 1)  # +1 for master
-        self.assertIn("master", chain[-1])
+            self.assertTrue(is_valid, leaf)
+            self.assertEqual(len(chain), 3)
+            self.assertTrue(chain[-1].startswith("master -> "), chain[-1])
+    
+    def test_deep_chain_verification(self):
+        """Test verification of a 100-token chain, in memory"""
+        self.network.create_master_token("master")
+        depth = 100
+        self.network.issue_tokens_batch(
+            [("master" if i == 0 else f"node{i - 1}", f"node{i}") for i in range(depth)])
+        
+        is_valid, chain = self.network.verify_token(f"node{depth - 1}")
+        self.assertTrue(is_valid, chain[-1])
+        self.assertEqual(len(chain), depth + 1)
+        self.assertTrue(chain[0].startswith(f"node{depth - 1} -> "), chain[0])
+        self.assertTrue(chain[-1].startswith("master -> "), chain[-1])
+        self.assertTrue(all(self.network.verify_all().values()))
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
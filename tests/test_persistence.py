@@ -5,6 +5,7 @@ import os
 import tempfile
 import shutil
 import json
+from pathlib import Path
 from pki_network import SecureToken, PKITokenNetwork
 
 class TestPersistence(unittest.TestCase):
@@ -12,12 +13,10 @@ class TestPersistence(unittest.TestCase):
     
     def setUp(self):
         """Set up test environment"""
-        self.test_dir = tempfile.mkdtemp()
-    
-    def tearDown(self):
-        """Clean up test environment"""
-        if os.path.exists(self.test_dir):
-            shutil.rmtree(self.test_dir)
+        # Registered before anything else can fail, so the directory never leaks
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.test_dir = tmp.name
     
     def test_token_file_creation(self):
         """Test that token files are created correctly"""
@@ -29,13 +28,29 @@ class TestPersistence(unittest.TestCase):
         self.assertTrue(os.path.exists(expected_file))
         
         # Verify file contents
-        with open(expected_file, 'r') as f:
-            data = json.load(f)
+        data = json.loads(Path(expected_file).read_bytes())
         
         self.assertEqual(data['node_id'], "master-node")
         self.assertEqual(data['token_hash'], master.token_hash)
         self.assertIsNone(data['issuer_token_hash'])
     
+    def test_in_memory_network_writes_nothing(self):
+        """Test that storage_dir=None keeps keys and tokens off disk"""
+        cwd = os.getcwd()
+        os.chdir(self.test_dir)
+        try:
+            network = PKITokenNetwork(None)
+            network.create_master_token("master")
+            network.issue_token("master", "child")
+            
+            self.assertEqual(os.listdir(self.test_dir), [])
+        finally:
+            os.chdir(cwd)
+        
+        self.assertTrue(network.verify_token("child")[0])
+        self.assertTrue(network.verify_token_direct_master("child")[0])
+        self.assertTrue(network.public_key_pem(network.master_public_key).startswith(b"-----BEGIN PUBLIC KEY-----"))
+    
     def test_token_file_loading(self):
         """Test that token files are loaded correctly on startup"""
         # Create network and tokens
@@ -88,9 +103,7 @@ class TestPersistence(unittest.TestCase):
         network.create_master_token("master")
         
         # Corrupt a token file
-        token_file = os.path.join(self.test_dir, "master_token.json")
-        with open(token_file, 'w') as f:
-            f.write("invalid json content")
+        Path(self.test_dir, "master_token.json").write_bytes(b"invalid json content")
         
         # Create new network instance - should handle corruption gracefully
         network2 = PKITokenNetwork(self.test_dir)
@@ -105,15 +118,13 @@ class TestPersistence(unittest.TestCase):
         network.create_master_token("master")
         
         # Modify token file to remove required field
-        token_file = os.path.join(self.test_dir, "master_token.json")
-        with open(token_file, 'r') as f:
-            data = json.load(f)
+        token_file = Path(self.test_dir, "master_token.json")
+        data = json.loads(token_file.read_bytes())
         
         # Remove required field
         del data['token_hash']
         
-        with open(token_file, 'w') as f:
-            json.dump(data, f)
+        token_file.write_bytes(json.dumps(data).encode())
         
         # Should handle missing fields gracefully
         network2 = PKITokenNetwork(self.test_dir)
@@ -134,11 +145,8 @@ class TestPersistence(unittest.TestCase):
         """Test that non-token files are ignored"""
         # Create some non-token files
         os.makedirs(self.test_dir, exist_ok=True)
-        with open(os.path.join(self.test_dir, "readme.txt"), 'w') as f:
-            f.write("This is not a token file")
-        
-        with open(os.path.join(self.test_dir, "config.json"), 'w') as f:
-            json.dump({"config": "value"}, f)
+        Path(self.test_dir, "readme.txt").write_bytes(b"This is not a token file")
+        Path(self.test_dir, "config.json").write_bytes(json.dumps({"config": "value"}).encode())
         
         # Create network - should ignore non-token files
         network = PKITokenNetwork(self.test_dir)
@@ -176,25 +184,27 @@ class TestPersistence(unittest.TestCase):
         network1 = PKITokenNetwork(self.test_dir)
         network1.create_master_token("master")
         
-        # Create 100 tokens in a chain
+        # Create a chain of tokens (PKI_CHAIN_DEPTH=100 for the full-size run)
+        depth = int(os.environ.get("PKI_CHAIN_DEPTH", "20"))
         parent = "master"
-        for i in range(100):
+        for i in range(depth):
             child_id = f"node{i:03d}"
             network1.issue_token(parent, child_id)
             parent = child_id
         
         # Verify file count
-        token_files = [f for f in os.listdir(self.test_dir) if f.endswith('_token.json')]
-        self.assertEqual(len(token_files), 101)  # 100 + 1 master
+        with os.scandir(self.test_dir) as entries:
+            token_files = sum(1 for entry in entries if entry.name.endswith('_token.json'))
+        self.assertEqual(token_files, depth + 1)  # chain + 1 master
         
         # Load in new network instance
         network2 = PKITokenNetwork(self.test_dir)
-        self.assertEqual(len(network2.tokens), 101)
+        self.assertEqual(len(network2.tokens), depth + 1)
         
         # Verify the end of the chain
-        is_valid, chain = network2.verify_token("node099")
+        is_valid, chain = network2.verify_token(parent)
         self.assertTrue(is_valid)
-        self.assertEqual(len(chain), 101)  # Full chain
+        self.assertEqual(len(chain), depth + 1)  # Full chain
     
     def test_token_file_format_validation(self):
         """Test validation of token file format"""
@@ -210,8 +220,7 @@ class TestPersistence(unittest.TestCase):
         }
         
         os.makedirs(self.test_dir, exist_ok=True)
-        with open(os.path.join(self.test_dir, "manual-token_token.json"), 'w') as f:
-            json.dump(token_data, f)
+        Path(self.test_dir, "manual-token_token.json").write_bytes(json.dumps(token_data).encode())
         
         # Load network
         network = PKITokenNetwork(self.test_dir)
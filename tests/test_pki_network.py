@@ -3,22 +3,21 @@
 import unittest
 import os
 import tempfile
-import shutil
 import json
-from pki_network import SecureToken, PKITokenNetwork
+from pki_network import SecureToken, PKITokenNetwork, load_public_key
 
 class TestPKITokenNetwork(unittest.TestCase):
     """Unit tests for PKITokenNetwork class"""
     
     def setUp(self):
         """Set up test environment with temporary directory"""
-        self.test_dir = tempfile.mkdtemp()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.test_dir = self._tmp.name
         self.network = PKITokenNetwork(self.test_dir)
     
     def tearDown(self):
         """Clean up test environment"""
-        if os.path.exists(self.test_dir):
-            shutil.rmtree(self.test_dir)
+        self._tmp.cleanup()
     
     def test_network_initialization(self):
         """Test PKITokenNetwork initialization"""
@@ -94,6 +93,38 @@ class TestPKITokenNetwork(unittest.TestCase):
             self.network.issue_token("master", "master")
         self.assertIn("Issuer and new node cannot be the same", str(context.exception))
     
+    def test_issue_tokens_batch(self):
+        """Test batch issuance matches issuing tokens one by one"""
+        self.network.create_master_token("master")
+        tokens = self.network.issue_tokens_batch([
+            ("master", "child1"),
+            ("master", "child2", "child2 data"),
+            ("child1", "grandchild"),
+        ])
+        
+        self.assertEqual([t.node_id for t in tokens], ["child1", "child2", "grandchild"])
+        self.assertEqual(tokens[1].token_data, "child2 data")
+        self.assertEqual(tokens[2].issuer_token_hash, tokens[0].token_hash)
+        for token in tokens:
+            self.assertIn(token.node_id, self.network.node_keys)
+            self.assertTrue(self.network.verify_token(token.node_id)[0])
+        
+        with self.assertRaises(ValueError):
+            self.network.issue_tokens_batch([("master", "child3"), ("master", "child1")])
+        self.assertIn("child3", self.network.tokens)
+        
+        # Nodes at or after the failing request get no keys, in memory or on disk
+        with self.assertRaises(ValueError):
+            self.network.issue_tokens_batch([("master", "c"), ("nope", "d"), ("master", "e")])
+        self.assertIn("c", self.network.node_keys)
+        key_files = os.listdir(os.path.join(self.test_dir, "keys"))
+        self.assertIn("c_public.pem", key_files)
+        for node_id in ("d", "e"):
+            self.assertNotIn(node_id, self.network.tokens)
+            self.assertNotIn(node_id, self.network.node_keys)
+            self.assertNotIn(f"{node_id}_private.pem", key_files)
+            self.assertNotIn(f"{node_id}_public.pem", key_files)
+    
     def test_get_token_info_existing(self):
         """Test getting token info for existing token"""
         master = self.network.create_master_token("master")
@@ -108,6 +139,37 @@ class TestPKITokenNetwork(unittest.TestCase):
         info = self.network.get_token_info("nonexistent")
         self.assertIsNone(info)
     
+    def test_load_one(self):
+        """Test reading a single token without loading the network"""
+        master = self.network.create_master_token("master")
+        self.network.issue_token("master", "child")
+        
+        token = PKITokenNetwork.load_one(self.test_dir, "master")
+        self.assertIsNotNone(token)
+        self.assertEqual(token.token_hash, master.token_hash)
+        self.assertIsNone(PKITokenNetwork.load_one(self.test_dir, "nonexistent"))
+        self.assertIsNone(PKITokenNetwork.load_one(self.test_dir, "../master"))
+    
+    def test_public_key_pem_cached(self):
+        """Test public keys are PEM-encoded once and reused"""
+        from cryptography.hazmat.primitives import serialization
+        self.network.create_master_token("master")
+        
+        key = self.network.master_public_key
+        pem = self.network.public_key_pem(key)
+        self.assertEqual(pem, key.public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo
+        ))
+        self.assertIs(self.network.public_key_pem(key), pem)
+        
+        # Keys loaded from storage are encoded on first use
+        reloaded = PKITokenNetwork(self.test_dir)
+        self.assertEqual(reloaded.public_key_pem(reloaded.master_public_key), pem)
+        
+        # Parsed PEM is reused as the same key object
+        self.assertIs(load_public_key(pem), load_public_key(pem))
+    
     def test_list_all_tokens_empty(self):
         """Test listing tokens when network is empty"""
         tokens = self.network.list_all_tokens()
@@ -126,19 +188,77 @@ class TestPKITokenNetwork(unittest.TestCase):
         self.assertIn("master", node_ids)
         self.assertIn("child1", node_ids)
         self.assertIn("child2", node_ids)
+    
+    def test_get_descendants(self):
+        """Test subtree lookup through the reverse issuer index"""
+        self.network.create_master_token("master")
+        self.network.issue_token("master", "child1")
+        self.network.issue_token("master", "child2")
+        self.network.issue_token("child1", "grandchild")
+        
+        self.assertEqual(set(self.network.get_descendants("master")),
+                         {"child1", "child2", "grandchild"})
+        self.assertEqual(self.network.get_descendants("child1"), ["grandchild"])
+        self.assertEqual(self.network.get_descendants("child2"), [])
+        
+        # The index is rebuilt when tokens are loaded from storage
+        reloaded = PKITokenNetwork(self.test_dir)
+        self.assertEqual(set(reloaded.get_descendants("master")),
+                         {"child1", "child2", "grandchild"})
+        
+        # Tokens deleted from the dict drop out, before and after clearing the cache
+        del self.network.tokens["child2"]
+        for clear in (False, True):
+            if clear:
+                self.network.clear_verification_cache()
+            self.assertEqual(set(self.network.get_descendants("master")), {"child1", "grandchild"})
+        
+        # Tokens added straight to the dict are indexed once the cache is cleared
+        self.network.tokens["direct"] = SecureToken("direct", "f" * 64, "child1")
+        self.network.clear_verification_cache()
+        self.assertEqual(set(self.network.get_descendants("child1")), {"grandchild", "direct"})
+    
+    def test_get_tokens_by_level(self):
+        """Test tokens are grouped by hierarchy level, fresh and after reload"""
+        self.network.create_master_token("master")
+        self.network.issue_token("master", "child1")
+        self.network.issue_token("master", "child2")
+        self.network.issue_token("child1", "grandchild")
+        
+        for network in (self.network, PKITokenNetwork(self.test_dir)):
+            by_level = network.get_tokens_by_level()
+            self.assertEqual(list(by_level), [0, 1, 2])
+            self.assertEqual([t.node_id for t in by_level[0]], ["master"])
+            self.assertEqual({t.node_id for t in by_level[1]}, {"child1", "child2"})
+            self.assertEqual([t.node_id for t in by_level[2]], ["grandchild"])
+        
+        # Tokens deleted from the dict drop out, before and after clearing the cache
+        del self.network.tokens["grandchild"]
+        for clear in (False, True):
+            if clear:
+                self.network.clear_verification_cache()
+            by_level = self.network.get_tokens_by_level()
+            self.assertEqual(list(by_level), [0, 1])
+            self.assertEqual({t.node_id for t in by_level[1]}, {"child1", "child2"})
+        
+        # Tokens added straight to the dict are indexed once the cache is cleared
+        self.network.tokens["direct"] = SecureToken("direct", "f" * 64, "master", hierarchy_level=1)
+        self.network.clear_verification_cache()
+        self.assertEqual({t.node_id for t in self.network.get_tokens_by_level()[1]},
+                         {"child1", "child2", "direct"})
 
 class TestTokenVerification(unittest.TestCase):
     """Tests for token verification functionality"""
     
     def setUp(self):
         """Set up test environment"""
-        self.test_dir = tempfile.mkdtemp()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.test_dir = self._tmp.name
         self.network = PKITokenNetwork(self.test_dir)
     
     def tearDown(self):
         """Clean up test environment"""
-        if os.path.exists(self.test_dir):
-            shutil.rmtree(self.test_dir)
+        self._tmp.cleanup()
     
     def test_verify_master_token(self):
         """Test verification of master token"""
@@ -147,7 +267,7 @@ class TestTokenVerification(unittest.TestCase):
         
         self.assertTrue(is_valid)
         self.assertEqual(len(chain), 1)
-        self.assertIn("master", chain[0])
+        self.assertTrue(chain[0].startswith("master -> "), chain[0])
     
     def test_verify_child_token(self):
         """Test verification of child token"""
@@ -158,8 +278,8 @@ class TestTokenVerification(unittest.TestCase):
         
         self.assertTrue(is_valid)
         self.assertEqual(len(chain), 2)
-        self.assertIn("child", chain[0])
-        self.assertIn("master", chain[1])
+        self.assertTrue(chain[0].startswith("child -> "), chain[0])
+        self.assertTrue(chain[1].startswith("master -> "), chain[1])
     
     def test_verify_grandchild_token(self):
         """Test verification of grandchild token"""
@@ -171,9 +291,9 @@ class TestTokenVerification(unittest.TestCase):
         
         self.assertTrue(is_valid)
         self.assertEqual(len(chain), 3)
-        self.assertIn("grandchild", chain[0])
-        self.assertIn("child", chain[1])
-        self.assertIn("master", chain[2])
+        self.assertTrue(chain[0].startswith("grandchild -> "), chain[0])
+        self.assertTrue(chain[1].startswith("child -> "), chain[1])
+        self.assertTrue(chain[2].startswith("master -> "), chain[2])
     
     def test_verify_nonexistent_token(self):
         """Test verification of non-existent token"""
@@ -194,7 +314,7 @@ class TestTokenVerification(unittest.TestCase):
         is_valid, chain = self.network.verify_token("orphan")
         
         self.assertFalse(is_valid)
-        self.assertIn("Issuer nonexistent-issuer not found", chain[-1])
+        self.assertTrue(chain[-1].startswith("Issuer nonexistent-issuer not found"), chain[-1])
     
     def test_verify_token_broken_hash_chain(self):
         """Test verification with broken hash chain"""
@@ -207,7 +327,163 @@ class TestTokenVerification(unittest.TestCase):
         is_valid, chain = self.network.verify_token("child")
         
         self.assertFalse(is_valid)
-        self.assertIn("Hash chain broken", chain[-1])
+        self.assertTrue(chain[-1].startswith("Hash chain broken"), chain[-1])
+
+    def test_verify_all(self):
+        """Test batch verification matches per-token verification"""
+        self.network.create_master_token("master")
+        self.network.issue_token("master", "child1")
+        self.network.issue_token("master", "child2")
+        self.network.issue_token("child1", "grandchild")
+        self.network.issue_token("child2", "broken-child")
+        self.network.tokens["broken-child"].issuer_token_hash = "broken-hash"
+        self.network.issue_token("broken-child", "broken-grandchild")
+        self.network.tokens["orphan"] = SecureToken("orphan", "fake-hash", "nonexistent-issuer")
+        
+        results = self.network.verify_all()
+        
+        self.assertEqual(set(results), set(self.network.tokens))
+        for node_id, is_valid in results.items():
+            self.assertEqual(is_valid, self.network.verify_token(node_id)[0], node_id)
+        self.assertTrue(results["grandchild"])
+        self.assertFalse(results["broken-child"])
+        self.assertFalse(results["broken-grandchild"])
+        self.assertFalse(results["orphan"])
+    
+    def test_verify_all_signatures(self):
+        """Test signature sweep matches per-token master verification"""
+        self.network.create_master_token("master")
+        self.network.issue_tokens_batch([("master", f"node{i}") for i in range(70)])
+        self.network.tokens["node3"].master_signature = self.network.tokens["node4"].master_signature
+        self.network.tokens["orphan"] = SecureToken("orphan", "fake-hash", "nonexistent-issuer")
+        
+        results = self.network.verify_all_signatures()
+        
+        self.assertEqual(set(results), set(self.network.tokens))
+        for node_id, is_valid in results.items():
+            self.assertEqual(is_valid, self.network.verify_token_direct_master(node_id)[0], node_id)
+        self.assertTrue(results["master"])
+        self.assertTrue(results["node4"])
+        self.assertFalse(results["node3"])
+        self.assertFalse(results["orphan"])
+    
+    def test_verify_indirect_issuance_paths(self):
+        """Test ancestor checks report the same path fresh and after reload"""
+        self.network.create_master_token("master")
+        self.network.issue_token("master", "child")
+        self.network.issue_token("child", "grandchild")
+        self.network.issue_token("grandchild", "leaf")
+        
+        reloaded = PKITokenNetwork(self.test_dir)
+        for network in (self.network, reloaded):
+            is_valid, chain = network.verify_token_as_issuer("child", "leaf")
+            self.assertTrue(is_valid)
+            self.assertEqual(chain, ["leaf", "grandchild", "child (issuer found)"])
+            
+            is_valid, chain = network.verify_token_as_issuer("leaf", "grandchild")
+            self.assertFalse(is_valid)
+            self.assertEqual(chain, ["grandchild", "child", "Issuer leaf not found in chain"])
+    
+    def test_verify_token_merkle(self):
+        """Test Merkle inclusion proofs for every token"""
+        self.network.create_master_token("master")
+        for i in range(4):
+            self.network.issue_token("master", f"child{i}")
+        root = self.network.merkle_root()
+        
+        for node_id, token in self.network.tokens.items():
+            is_valid, _ = self.network.verify_token_merkle(node_id)
+            self.assertTrue(is_valid, node_id)
+            proof = self.network.get_merkle_proof(node_id)
+            self.assertTrue(PKITokenNetwork.verify_merkle_proof(token.token_hash, proof, root))
+            self.assertFalse(PKITokenNetwork.verify_merkle_proof("forged-hash", proof, root))
+            self.assertTrue(self.network.verify_token_merkle(node_id, root)[0])
+        
+        # Short proofs end at a node of the cached mid-tree layer
+        level, layer = self.network.merkle_cached_layer()
+        short = self.network.get_merkle_proof("child0", level)
+        self.assertLess(len(short), len(self.network.get_merkle_proof("child0")))
+        self.assertIn(PKITokenNetwork._replay_merkle_proof(
+            self.network.tokens["child0"].token_hash, short).hex(), layer)
+        
+        # Issuing a token changes the root; old roots no longer verify new tokens
+        self.network.issue_token("master", "late-child")
+        self.assertNotEqual(self.network.merkle_root(), root)
+        self.assertTrue(self.network.verify_token_merkle("late-child")[0])
+        self.assertFalse(self.network.verify_token_merkle("late-child", root)[0])
+        self.assertFalse(self.network.verify_token_merkle("nonexistent")[0])
+        
+        # Tokens placed in the dict directly, bypassing issue_token, rebuild the tree
+        root = self.network.merkle_root()
+        self.network.tokens["direct"] = SecureToken("direct", "f" * 64, "master")
+        self.assertTrue(self.network.verify_token_merkle("direct")[0])
+        self.assertFalse(self.network.verify_token_merkle("direct", root)[0])
+        
+        # A swap that keeps the token count still rebuilds the tree
+        root = self.network.merkle_root()
+        old_proof = self.network.get_merkle_proof("child3")
+        deleted_hash = self.network.tokens.pop("child3").token_hash
+        self.network.tokens["swapped"] = SecureToken("swapped", "f" * 64, "master")
+        new_root = self.network.merkle_root()
+        self.assertNotEqual(new_root, root)
+        self.assertTrue(self.network.verify_token_merkle("swapped")[0])
+        self.assertIsNone(self.network.get_merkle_proof("child3"))
+        self.assertFalse(PKITokenNetwork.verify_merkle_proof(deleted_hash, old_proof, new_root))
+    
+    def test_verify_token_merkle_is_inclusion_only(self):
+        """Test Merkle inclusion does not vouch for an unsigned forged token"""
+        self.network.create_master_token("master")
+        self.network.tokens["forged"] = SecureToken("forged", "f" * 64, "master")
+        self.network.clear_verification_cache()
+        
+        is_valid, result = self.network.verify_token_merkle("forged")
+        self.assertTrue(is_valid)
+        self.assertTrue(result[0].startswith("Merkle inclusion proof matched"), result[0])
+        self.assertFalse(self.network.verify_token("forged")[0])
+    
+    def test_verify_token_cached_chain(self):
+        """Test repeated verification is stable and consistent with sub-chains"""
+        self.network.create_master_token("master")
+        self.network.issue_token("master", "child")
+        grandchild = self.network.issue_token("child", "grandchild")
+
+        first = self.network.verify_token("grandchild")
+        second = self.network.verify_token("grandchild")
+        self.assertEqual(first, second)
+
+        # The intermediate chain is the grandchild's chain minus its first hop
+        is_valid, chain = self.network.verify_token("child")
+        self.assertTrue(is_valid)
+        self.assertEqual(chain, first[1][1:])
+
+        # In-place edits are picked up
+        grandchild.issuer_token_hash = "broken-hash"
+        self.network.clear_verification_cache()
+        is_valid, chain = self.network.verify_token("grandchild")
+        self.assertFalse(is_valid)
+        self.assertTrue(chain[-1].startswith("Hash chain broken"), chain[-1])
+    
+    def test_verify_token_cached_chain_rechecks_links(self):
+        """Test a verified chain is rejected once a link above it breaks"""
+        self.network.create_master_token("master")
+        child = self.network.issue_token("master", "child")
+        self.network.issue_token("child", "grandchild")
+        self.assertTrue(self.network.verify_token("grandchild")[0])
+        
+        # Break the link above an already verified node without clearing the cache
+        child.issuer_token_hash = "broken-hash"
+        for node_id in ("child", "grandchild"):
+            is_valid, chain = self.network.verify_token(node_id)
+            self.assertFalse(is_valid, node_id)
+            self.assertTrue(chain[-1].startswith("Hash chain broken"), chain[-1])
+        self.assertEqual(self.network.verify_all(),
+                         {"master": True, "child": False, "grandchild": False})
+        
+        # A forged replacement for the intermediate token is rejected as well
+        child.issuer_token_hash = self.network.master_token.token_hash
+        self.assertTrue(self.network.verify_token("grandchild")[0])
+        self.network.tokens["child"] = SecureToken("child", "f" * 64, "master")
+        self.assertFalse(self.network.verify_token("grandchild")[0])
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 import unittest
+import hashlib
 import os
 import tempfile
 import shutil
@@ -8,12 +9,20 @@ import json
 from datetime import datetime, timezone
 from pki_network import SecureToken, PKITokenNetwork
 
+_INVALID_IDS = ("node@test", "node#test", "node space", "node/test")
+
 class TestSecureToken(unittest.TestCase):
     """Unit tests for SecureToken class"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Tokens shared by the tests that only read them"""
+        cls.base_token = SecureToken("test-node")
+        cls.issuer_token = SecureToken("child-node", "abc123def456", "issuer-node")
+    
     def test_token_creation_with_valid_node_id(self):
         """Test successful token creation with valid node ID"""
-        token = SecureToken("test-node")
+        token = self.base_token
         self.assertEqual(token.node_id, "test-node")
         self.assertIsNone(token.issuer_token_hash)
         self.assertIsNone(token.issuer_id)
@@ -30,17 +39,22 @@ class TestSecureToken(unittest.TestCase):
     
     def test_token_creation_with_issuer(self):
         """Test token creation with issuer information"""
-        issuer_hash = "abc123def456"
-        issuer_id = "issuer-node"
-        token = SecureToken("child-node", issuer_hash, issuer_id)
-        self.assertEqual(token.issuer_token_hash, issuer_hash)
-        self.assertEqual(token.issuer_id, issuer_id)
+        token = self.issuer_token
+        self.assertEqual(token.issuer_token_hash, "abc123def456")
+        self.assertEqual(token.issuer_id, "issuer-node")
     
     def test_token_hash_generation(self):
         """Test that token hash is generated correctly"""
-        token = SecureToken("test-node")
+        token = self.base_token
         self.assertEqual(len(token.token_hash), 64)  # SHA256 hex length
-        self.assertTrue(all(c in '0123456789abcdef' for c in token.token_hash))
+        self.assertRegex(token.token_hash, r'\A[0-9a-f]{64}\Z')
+    
+    def test_token_hash_large_token_data(self):
+        """Test that large token data hashes the same as the joined preimage"""
+        token = SecureToken("test-node", "issuer-hash", "issuer-id", "dätä-" * 50000)
+        preimage = (f"{token.node_id}:{token.issuer_token_hash}:{token.issuer_id}:"
+                    f"{token.timestamp}:{token.token_id}:{token.token_data}")
+        self.assertEqual(token.token_hash, hashlib.sha256(preimage.encode()).hexdigest())
     
     def test_token_hash_uniqueness(self):
         """Test that different tokens have different hashes"""
@@ -69,9 +83,8 @@ class TestSecureToken(unittest.TestCase):
     
     def test_invalid_node_id_special_characters(self):
         """Test that node ID with invalid characters raises ValueError"""
-        invalid_ids = ["node@test", "node#test", "node space", "node/test"]
-        for invalid_id in invalid_ids:
-            with self.assertRaises(ValueError):
+        for invalid_id in _INVALID_IDS:
+            with self.subTest(id=invalid_id), self.assertRaises(ValueError):
                 SecureToken(invalid_id)
     
     def test_valid_node_id_characters(self):
@@ -96,6 +109,31 @@ class TestSecureToken(unittest.TestCase):
         self.assertEqual(token_dict['issuer_id'], "issuer-id")
         self.assertEqual(token_dict['token_data'], "test-data")
     
+    def test_to_dict_cache(self):
+        """Test that the memoised dict is returned as an independent copy"""
+        token = SecureToken("test-node", token_data="test-data")
+        first = token.to_dict()
+        first['token_data'] = "changed"
+        first['verification_paths'].append("bogus")
+        
+        second = token.to_dict()
+        self.assertEqual(second['token_data'], "test-data")
+        self.assertEqual(second['verification_paths'], ["chain"])
+        
+        # Direct field edits are picked up after invalidating the cache
+        token.token_data = "edited"
+        token.invalidate_cache()
+        self.assertEqual(token.to_dict()['token_data'], "edited")
+        self.assertEqual(json.loads(token.to_json()), token.to_dict())
+    
+    def test_to_dict_verification_paths_sorted(self):
+        """Test verification paths serialize in a stable, sorted order"""
+        token = SecureToken("test-node")
+        token.verification_paths.update({"master-direct", "issuer-direct"})
+        token.invalidate_cache()
+        self.assertEqual(token.to_dict()['verification_paths'],
+                         ["chain", "issuer-direct", "master-direct"])
+    
     def test_from_dict_conversion(self):
         """Test token deserialization from dictionary"""
         original = SecureToken("test-node", "issuer-hash", "issuer-id", "test-data")
@@ -111,9 +149,9 @@ class TestSecureToken(unittest.TestCase):
     
     def test_timestamp_format(self):
         """Test that timestamp is in ISO format"""
-        token = SecureToken("test-node")
+        token = self.base_token
         # Should not raise exception when parsing
-        parsed_time = datetime.fromisoformat(token.timestamp.replace('Z', '+00:00'))
+        parsed_time = datetime.fromisoformat(token.timestamp)
         self.assertIsInstance(parsed_time, datetime)
 
 if __name__ == '__main__':
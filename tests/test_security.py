@@ -3,24 +3,46 @@
 import unittest
 import os
 import tempfile
-import shutil
 import json
+import re
 import hashlib
+from pathlib import Path
 from pki_network import SecureToken, PKITokenNetwork
 
-class TestSecurityAndTamperDetection(unittest.TestCase):
-    """Test security features and tamper detection"""
-    
-    def setUp(self):
-        """Set up test environment"""
-        self.test_dir = tempfile.mkdtemp()
-        self.network = PKITokenNetwork(self.test_dir)
-    
-    def tearDown(self):
-        """Clean up test environment"""
-        if os.path.exists(self.test_dir):
-            shutil.rmtree(self.test_dir)
-    
+# Forged 64-character hashes for the chain injection test
+_FAKE_MASTER_HASH = "fake_hash_" + "0" * 54
+_FAKE_CHILD_HASH = "fake_child_hash_" + "0" * 48
+
+# Node IDs that must never reach the filesystem or a shell
+_MALICIOUS_IDS = (
+    "../../../etc/passwd",  # Path traversal
+    "node\x00malicious",    # Null byte injection
+    "node;rm -rf /",        # Command injection
+    "node`whoami`",         # Command substitution
+    "node$(whoami)",        # Command substitution
+    "node|whoami",          # Pipe injection
+)
+
+def _write_token_file(path, data):
+    """Write token JSON in one binary write, swapped in atomically with Path.replace"""
+    tmp_path = Path(path + ".tmp")
+    tmp_path.write_bytes(json.dumps(data).encode())
+    tmp_path.replace(path)
+
+def _tamper_token_file(path, **changes):
+    """Overwrite fields of a stored token file in place, without a JSON round-trip"""
+    buf = Path(path).read_bytes()
+    for key, value in changes.items():
+        # Matches a JSON string (escapes included), null or integer value
+        field = re.compile(rb'"%s"\s*:\s*(?:"(?:[^"\\]|\\.)*"|null|-?\d+)' % re.escape(key.encode()))
+        replacement = b'"%s":%s' % (key.encode(), json.dumps(value).encode())
+        buf, count = field.subn(lambda _match: replacement, buf)
+        assert count == 1, f"field {key!r} not found in {path}"
+    Path(path).write_bytes(buf)
+
+class TestTokenHashSecurity(unittest.TestCase):
+    """Security properties of SecureToken on its own; no network or storage needed"""
+
     def test_hash_consistency(self):
         """Test that token hashes are consistent and deterministic"""
         # Create same token multiple times - hashes should be different due to timestamp/UUID
@@ -42,7 +64,7 @@ class TestSecurityAndTamperDetection(unittest.TestCase):
         self.assertEqual(len(token.token_hash), 64)
         
         # Should only contain hex characters
-        self.assertTrue(all(c in '0123456789abcdef' for c in token.token_hash))
+        self.assertRegex(token.token_hash, r'\A[0-9a-f]{64}\Z')
         
         # Should be a valid hex string
         try:
@@ -50,6 +72,50 @@ class TestSecurityAndTamperDetection(unittest.TestCase):
         except ValueError:
             self.fail("Token hash is not a valid hex string")
     
+    def test_replay_attack_resistance(self):
+        """Test resistance to replay attacks"""
+        # Create tokens with identical data but different timestamps
+        token1 = SecureToken("node", None, None, "same data")
+        token2 = SecureToken("node", None, None, "same data")
+        
+        # Should have different hashes due to different timestamps/UUIDs
+        self.assertNotEqual(token1.token_hash, token2.token_hash)
+        self.assertNotEqual(token1.token_id, token2.token_id)
+        self.assertNotEqual(token1.timestamp, token2.timestamp)
+    
+    def test_malicious_node_id_injection(self):
+        """Test protection against malicious node IDs"""
+        for malicious_id in _MALICIOUS_IDS:
+            with self.subTest(id=malicious_id), self.assertRaises(ValueError):
+                SecureToken(malicious_id)
+    
+    def test_hash_collision_resistance(self):
+        """Test that similar inputs produce different hashes"""
+        # Create tokens with very similar data
+        token1 = SecureToken("node1", "issuer_hash", "issuer", "data")
+        token2 = SecureToken("node2", "issuer_hash", "issuer", "data")  # Only node ID differs
+        
+        self.assertNotEqual(token1.token_hash, token2.token_hash)
+        
+        # Test with similar but different issuer hashes
+        token3 = SecureToken("node", "issuer_hash1", "issuer", "data")
+        token4 = SecureToken("node", "issuer_hash2", "issuer", "data")
+        
+        self.assertNotEqual(token3.token_hash, token4.token_hash)
+
+class TestSecurityAndTamperDetection(unittest.TestCase):
+    """Test security features and tamper detection"""
+    
+    def setUp(self):
+        """Set up test environment"""
+        self._tmp = tempfile.TemporaryDirectory()
+        self.test_dir = self._tmp.name
+        self.network = PKITokenNetwork(self.test_dir)
+    
+    def tearDown(self):
+        """Clean up test environment"""
+        self._tmp.cleanup()
+    
     def test_token_modification_detection(self):
         """Test that token modifications are detected"""
         self.network.create_master_token("master")
@@ -76,15 +142,9 @@ class TestSecurityAndTamperDetection(unittest.TestCase):
         self.assertTrue(is_valid)
         
         # Tamper with stored token file
-        child_file = os.path.join(self.test_dir, "child_token.json")
-        with open(child_file, 'r') as f:
-            data = json.load(f)
-        
         # Modify the token data but keep the hash
-        data['token_data'] = "tampered data"
-        
-        with open(child_file, 'w') as f:
-            json.dump(data, f)
+        child_file = os.path.join(self.test_dir, "child_token.json")
+        _tamper_token_file(child_file, token_data="tampered data")
         
         # Reload network and verify tampering is detected
         network2 = PKITokenNetwork(self.test_dir)
@@ -100,15 +160,9 @@ class TestSecurityAndTamperDetection(unittest.TestCase):
         self.network.issue_token("master", "child")
         
         # Tamper with master token hash in file
-        master_file = os.path.join(self.test_dir, "master_token.json")
-        with open(master_file, 'r') as f:
-            data = json.load(f)
-        
         # Change the master token hash
-        data['token_hash'] = "tampered_hash_1234567890abcdef" * 2  # 64 chars
-        
-        with open(master_file, 'w') as f:
-            json.dump(data, f)
+        master_file = os.path.join(self.test_dir, "master_token.json")
+        _tamper_token_file(master_file, token_hash="tampered_hash_1234567890abcdef" * 2)  # 64 chars
         
         # Reload network
         network2 = PKITokenNetwork(self.test_dir)
@@ -116,7 +170,7 @@ class TestSecurityAndTamperDetection(unittest.TestCase):
         # Child verification should fail due to broken hash chain
         is_valid, chain = network2.verify_token("child")
         self.assertFalse(is_valid)
-        self.assertIn("Hash chain broken", chain[-1])
+        self.assertTrue(chain[-1].startswith("Hash chain broken"), chain[-1])
     
     def test_chain_injection_attack(self):
         """Test resistance to chain injection attacks"""
@@ -131,12 +185,11 @@ class TestSecurityAndTamperDetection(unittest.TestCase):
             "timestamp": "2023-01-01T00:00:00+00:00",
             "token_id": "fake-uuid",
             "token_data": "fake master",
-            "token_hash": "fake_hash_" + "0" * 54  # 64 chars total
+            "token_hash": _FAKE_MASTER_HASH
         }
         
         fake_file = os.path.join(self.test_dir, "fake-master_token.json")
-        with open(fake_file, 'w') as f:
-            json.dump(fake_master_data, f)
+        _write_token_file(fake_file, fake_master_data)
         
         # Create fake child pointing to fake master
         fake_child_data = {
@@ -146,12 +199,11 @@ class TestSecurityAndTamperDetection(unittest.TestCase):
             "timestamp": "2023-01-01T00:00:00+00:00",
             "token_id": "fake-child-uuid",
             "token_data": "fake child",
-            "token_hash": "fake_child_hash_" + "0" * 47  # 64 chars total
+            "token_hash": _FAKE_CHILD_HASH
         }
         
         fake_child_file = os.path.join(self.test_dir, "fake-child_token.json")
-        with open(fake_child_file, 'w') as f:
-            json.dump(fake_child_data, f)
+        _write_token_file(fake_child_file, fake_child_data)
         
         # Reload network
         network2 = PKITokenNetwork(self.test_dir)
@@ -165,17 +217,6 @@ class TestSecurityAndTamperDetection(unittest.TestCase):
         # (Implementation dependent - this tests the concept)
         self.assertIsNotNone(network2.master_token)
     
-    def test_replay_attack_resistance(self):
-        """Test resistance to replay attacks"""
-        # Create tokens with identical data but different timestamps
-        token1 = SecureToken("node", None, None, "same data")
-        token2 = SecureToken("node", None, None, "same data")
-        
-        # Should have different hashes due to different timestamps/UUIDs
-        self.assertNotEqual(token1.token_hash, token2.token_hash)
-        self.assertNotEqual(token1.token_id, token2.token_id)
-        self.assertNotEqual(token1.timestamp, token2.timestamp)
-    
     def test_circular_reference_detection(self):
         """Test detection of circular references in token chain"""
         self.network.create_master_token("master")
@@ -183,53 +224,24 @@ class TestSecurityAndTamperDetection(unittest.TestCase):
         self.network.issue_token("node-a", "node-b")
         
         # Manually create circular reference by modifying file
-        node_a_file = os.path.join(self.test_dir, "node-a_token.json")
-        with open(node_a_file, 'r') as f:
-            data = json.load(f)
-        
         # Make node-a point to node-b (creating A -> B -> A cycle)
+        node_a_file = os.path.join(self.test_dir, "node-a_token.json")
         node_b_hash = self.network.tokens["node-b"].token_hash
-        data['issuer_token_hash'] = node_b_hash
-        data['issuer_id'] = "node-b"
-        
-        with open(node_a_file, 'w') as f:
-            json.dump(data, f)
+        _tamper_token_file(node_a_file, issuer_token_hash=node_b_hash, issuer_id="node-b")
         
         # Reload network
         network2 = PKITokenNetwork(self.test_dir)
         
         # Verification should detect the circular reference
         # (This would cause infinite loop without proper detection)
-        # Implementation should have cycle detection mechanism
-    
-    def test_malicious_node_id_injection(self):
-        """Test protection against malicious node IDs"""
-        malicious_ids = [
-            "../../../etc/passwd",  # Path traversal
-            "node\x00malicious",    # Null byte injection
-            "node;rm -rf /",        # Command injection
-            "node`whoami`",         # Command substitution
-            "node$(whoami)",        # Command substitution
-            "node|whoami",          # Pipe injection
-        ]
-        
-        for malicious_id in malicious_ids:
-            with self.assertRaises(ValueError, msg=f"Should reject malicious ID: {malicious_id}"):
-                SecureToken(malicious_id)
-    
-    def test_hash_collision_resistance(self):
-        """Test that similar inputs produce different hashes"""
-        # Create tokens with very similar data
-        token1 = SecureToken("node1", "issuer_hash", "issuer", "data")
-        token2 = SecureToken("node2", "issuer_hash", "issuer", "data")  # Only node ID differs
+        for node_id in ("node-a", "node-b"):
+            is_valid, chain = network2.verify_token(node_id)
+            self.assertFalse(is_valid)
+            self.assertTrue(chain[-1].startswith("Circular issuer reference"), chain[-1])
         
-        self.assertNotEqual(token1.token_hash, token2.token_hash)
-        
-        # Test with similar but different issuer hashes
-        token3 = SecureToken("node", "issuer_hash1", "issuer", "data")
-        token4 = SecureToken("node", "issuer_hash2", "issuer", "data")
-        
-        self.assertNotEqual(token3.token_hash, token4.token_hash)
+        is_valid, chain = network2.verify_token_as_issuer("master", "node-b")
+        self.assertFalse(is_valid)
+        self.assertFalse(network2.verify_all()["node-b"])
     
     def test_token_uniqueness_across_restarts(self):
         """Test that tokens remain unique across system restarts"""
@@ -249,22 +261,20 @@ class TestSecurityAndTamperDetection(unittest.TestCase):
         new_child = network2.issue_token("master", "new-child")
         self.assertNotEqual(new_child.token_hash, original_hash)
     
+    @unittest.skipIf(os.environ.get("PKI_FAST_TESTS"), "storage I/O check skipped by --fast")
     def test_storage_permission_security(self):
         """Test that storage directory permissions are secure"""
         # This test checks that the storage directory is created with appropriate permissions
         # In a production system, you'd want restrictive permissions
         
-        # Check that directory exists and is accessible
-        self.assertTrue(os.path.exists(self.test_dir))
-        self.assertTrue(os.access(self.test_dir, os.R_OK))
-        self.assertTrue(os.access(self.test_dir, os.W_OK))
+        # Owner must be able to read and write the directory; one stat covers both bits
+        self.assertEqual(os.stat(self.test_dir).st_mode & 0o600, 0o600)
         
         # Create a token and check file permissions
         self.network.create_master_token("master")
         token_file = os.path.join(self.test_dir, "master_token.json")
         
-        self.assertTrue(os.path.exists(token_file))
-        self.assertTrue(os.access(token_file, os.R_OK))
+        self.assertTrue(os.stat(token_file).st_mode & 0o400)
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+import unittest
+import os
+import json
+import tarfile
+import tempfile
+from token_packager import create_secure_token_package, create_packages_bulk
+from pki_network import PKITokenNetwork
+
+class TestTokenPackager(unittest.TestCase):
+    """Tests for secure distribution packages"""
+
+    def setUp(self):
+        """Set up test environment"""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.test_dir = tmp.name
+        self.network = PKITokenNetwork(None)
+        self.network.create_master_token("root")
+        self.network.issue_token("root", "child1")
+        self.network.issue_token("root", "child2")
+
+    def _read_dir(self, path):
+        """Map each file name in path to its bytes"""
+        contents = {}
+        for name in os.listdir(path):
+            with open(os.path.join(path, name), 'rb') as f:
+                contents[name] = f.read()
+        return contents
+
+    def test_create_package_archive(self):
+        """Test archive=True writes one tar holding the same files as the directory package"""
+        files_dir = os.path.join(self.test_dir, "files")
+        archive_dir = os.path.join(self.test_dir, "archive")
+        expected = create_secure_token_package(self.network, "child1", files_dir)
+        instructions = create_secure_token_package(self.network, "child1", archive_dir, archive=True)
+        self.assertEqual(instructions, expected)
+
+        self.assertEqual(os.listdir(archive_dir), ["child1_package.tar"])
+        with tarfile.open(os.path.join(archive_dir, "child1_package.tar")) as tar:
+            members = tar.getmembers()
+            self.assertTrue(all(member.isfile() for member in members))
+            archived = {member.name: tar.extractfile(member).read() for member in members}
+        self.assertEqual(len(members), len(archived))  # no duplicate entries
+        self.assertEqual(archived, self._read_dir(files_dir))
+
+    def test_returned_instructions_are_independent(self):
+        """Test modifying returned instructions does not leak into later packages"""
+        first = create_secure_token_package(self.network, "child1", os.path.join(self.test_dir, "first"))
+        first["instructions"].append("HACK")
+        first["security_notes"].clear()
+
+        package_dir = os.path.join(self.test_dir, "second")
+        second = create_secure_token_package(self.network, "child2", package_dir)
+        self.assertNotIn("HACK", second["instructions"])
+        self.assertTrue(second["security_notes"])
+        with open(os.path.join(package_dir, "README.json"), 'rb') as f:
+            self.assertEqual(json.loads(f.read())["instructions"], second["instructions"])
+
+    def test_create_packages_bulk(self):
+        """Test bulk packaging writes one package directory per node"""
+        output_root = os.path.join(self.test_dir, "packages")
+        dirs = create_packages_bulk(self.network, ["child1", "child2"], output_root)
+
+        self.assertEqual(dirs, {
+            node_id: os.path.join(output_root, f"{node_id}_secure_package")
+            for node_id in ("child1", "child2")
+        })
+        for node_id, package_dir in dirs.items():
+            files = self._read_dir(package_dir)
+            self.assertEqual(set(files), {f"{node_id}_certificate.json", "master_public_key.pem",
+                                          "root_public_key.pem", "README.json"})
+            certificate = json.loads(files[f"{node_id}_certificate.json"])
+            self.assertEqual(certificate["token_hash"], self.network.tokens[node_id].token_hash)
+            self.assertEqual(json.loads(files["README.json"])["node_id"], node_id)
+            self.assertNotIn(b"PRIVATE KEY", b"".join(files.values()))
+
+            # Same contents as packaging the node on its own
+            single_dir = os.path.join(self.test_dir, f"{node_id}_single")
+            create_secure_token_package(self.network, node_id, single_dir)
+            self.assertEqual(files, self._read_dir(single_dir))
+
+    def test_create_packages_bulk_unknown_node(self):
+        """Test an unknown node id is rejected before any package is written"""
+        output_root = os.path.join(self.test_dir, "packages")
+        with self.assertRaises(ValueError):
+            create_packages_bulk(self.network, ["child1", "nonexistent"], output_root)
+        self.assertFalse(os.path.exists(output_root))
+
+if __name__ == '__main__':
+    unittest.main()
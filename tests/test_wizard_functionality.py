@@ -1,204 +1,79 @@
 #!/usr/bin/env python3
 
 import os
-import tempfile
-import shutil
+import importlib.util
+from pathlib import Path
+import pytest
 from token_manager import PKIWizard
-from unittest.mock import patch
-import io
-import sys
+from pki_network import PKITokenNetwork
 
-def test_wizard_core_functionality():
+@pytest.fixture(scope="module")
+def wizard_env(tmp_path_factory):
+    """Wizard bound to a fresh network with a master token, built once per module"""
+    test_dir = str(tmp_path_factory.mktemp("wizard"))
+    wizard = PKIWizard()
+    wizard.storage_dir = test_dir
+    wizard.network = PKITokenNetwork(test_dir)
+    wizard.network.create_master_token("test-master")
+    return wizard, test_dir
+
+def test_wizard_core_functionality(wizard_env):
     """Test wizard core functionality without interactive input"""
-    
-    print("🧪 Testing PKI Wizard Core Functionality")
-    print("=" * 50)
-    
-    # Create temporary directory for testing
-    test_dir = tempfile.mkdtemp()
-    
-    try:
-        # Test wizard initialization
-        print("1. Testing wizard initialization...")
-        wizard = PKIWizard()
-        wizard.storage_dir = test_dir
-        
-        # Mock the setup to avoid interactive prompts
-        from pki_network import PKITokenNetwork
-        wizard.network = PKITokenNetwork(test_dir)
-        
-        print("   ✅ Wizard initialized successfully")
-        
-        # Test network loading
-        print("2. Testing network loading...")
-        if wizard.network:
-            print(f"   ✅ Network loaded: {len(wizard.network.tokens)} tokens")
-        else:
-            print("   ❌ Network loading failed")
-            return False
-        
-        # Test utility methods
-        print("3. Testing utility methods...")
-        
-        # Test menu formatting (without user input)
-        with patch('builtins.input', return_value='0'):
-            try:
-                choice = wizard.print_menu("Test Menu", ["Option 1", "Option 2"])
-                print(f"   ✅ Menu system works: returned {choice}")
-            except:
-                print("   ❌ Menu system failed")
-                return False
-        
-        # Test input validation
-        print("4. Testing input validation...")
-        with patch('builtins.input', return_value='test-input'):
-            try:
-                result = wizard.get_input("Test prompt", required=False)
-                print(f"   ✅ Input validation works: '{result}'")
-            except:
-                print("   ❌ Input validation failed")
-                return False
-        
-        # Test confirmation
-        print("5. Testing confirmation prompts...")
-        with patch('builtins.input', return_value='y'):
-            try:
-                confirmed = wizard.confirm_action("Test confirmation")
-                print(f"   ✅ Confirmation works: {confirmed}")
-            except:
-                print("   ❌ Confirmation failed")
-                return False
-        
-        # Test screen clearing (should not fail)
-        print("6. Testing screen utilities...")
-        try:
-            wizard.clear_screen()
-            wizard.print_header()
-            print("   ✅ Screen utilities work")
-        except:
-            print("   ❌ Screen utilities failed")
-            return False
-        
-        print("\n✅ All core wizard functionality tests passed!")
-        return True
-        
-    except Exception as e:
-        print(f"   ❌ Test failed with error: {e}")
-        return False
-    
-    finally:
-        # Cleanup
-        if os.path.exists(test_dir):
-            shutil.rmtree(test_dir)
+    wizard, _ = wizard_env
+    assert wizard.network.master_token.node_id == "test-master"
+
+    # Scripted answers for the menu, input and confirmation prompts below
+    answers = iter(['0', 'test-input', 'y'])
+    wizard._input = lambda _prompt: next(answers)
+
+    assert wizard.print_menu("Test Menu", ["Option 1", "Option 2"]) == 0
+    assert wizard.get_input("Test prompt", required=False) == "test-input"
+    assert wizard.confirm_action("Test confirmation") is True
 
-def test_wizard_integration():
+    # Screen utilities should not fail
+    wizard.clear_screen()
+    wizard.print_header()
+
+def test_wizard_integration(wizard_env):
     """Test wizard integration with PKI system"""
-    
-    print("\n🔗 Testing Wizard PKI Integration")
-    print("=" * 50)
-    
-    test_dir = tempfile.mkdtemp()
-    
+    from token_packager import create_secure_token_package
+
+    wizard, test_dir = wizard_env
+    child_token = wizard.network.issue_token("test-master", "test-child", "Test Child")
+    assert child_token.issuer_id == "test-master"
+
+    is_valid, chain = wizard.network.verify_token("test-child")
+    assert is_valid, chain
+
+    package_dir = os.path.join(test_dir, "test_package")
+    create_secure_token_package(wizard.network, "test-child", package_dir)
+    assert os.listdir(package_dir)
+
+def test_wizard_verify_cache_tracks_lineage(wizard_env):
+    """Cached wizard verifications are not reused once a link above the token breaks"""
+    wizard, _ = wizard_env
+    network = PKITokenNetwork(None)
+    network.create_master_token("m")
+    middle = network.issue_token("m", "a")
+    network.issue_token("a", "b")
+    wizard.network, saved = network, wizard.network
     try:
-        # Initialize wizard with PKI network
-        wizard = PKIWizard()
-        wizard.storage_dir = test_dir
-        
-        from pki_network import PKITokenNetwork
-        wizard.network = PKITokenNetwork(test_dir)
-        
-        # Test master token creation (programmatically)
-        print("1. Testing master token creation...")
-        try:
-            master_token = wizard.network.create_master_token("test-master")
-            print(f"   ✅ Master token created: {master_token.node_id}")
-        except Exception as e:
-            print(f"   ❌ Master token creation failed: {e}")
-            return False
-        
-        # Test token issuance
-        print("2. Testing token issuance...")
-        try:
-            child_token = wizard.network.issue_token("test-master", "test-child", "Test Child")
-            print(f"   ✅ Child token issued: {child_token.node_id}")
-        except Exception as e:
-            print(f"   ❌ Token issuance failed: {e}")
-            return False
-        
-        # Test verification
-        print("3. Testing token verification...")
-        try:
-            is_valid, chain = wizard.network.verify_token("test-child")
-            print(f"   ✅ Token verification: {'VALID' if is_valid else 'INVALID'}")
-        except Exception as e:
-            print(f"   ❌ Token verification failed: {e}")
-            return False
-        
-        # Test secure package creation
-        print("4. Testing secure package creation...")
-        try:
-            from token_packager import create_secure_token_package
-            package_dir = os.path.join(test_dir, "test_package")
-            create_secure_token_package(wizard.network, "test-child", package_dir)
-            
-            if os.path.exists(package_dir):
-                files = os.listdir(package_dir)
-                print(f"   ✅ Secure package created with {len(files)} files")
-            else:
-                print("   ❌ Secure package directory not created")
-                return False
-                
-        except Exception as e:
-            print(f"   ❌ Secure package creation failed: {e}")
-            return False
-        
-        print("\n✅ All wizard integration tests passed!")
-        return True
-        
-    except Exception as e:
-        print(f"   ❌ Integration test failed: {e}")
-        return False
-    
+        first = wizard._cached_verify("chain", "b")
+        assert first[0]
+        assert wizard._cached_verify("chain", "b") is first  # unchanged lineage hits the cache
+        middle.issuer_token_hash = "broken"
+        assert not wizard._cached_verify("chain", "b")[0]
     finally:
-        if os.path.exists(test_dir):
-            shutil.rmtree(test_dir)
+        wizard.network = saved
+        wizard._verify_cache.clear()
 
-def main():
-    """Run all wizard tests"""
-    
-    print("🧙‍♂️ PKI WIZARD FUNCTIONALITY TESTS")
-    print("=" * 60)
-    
-    # Test core functionality
-    core_passed = test_wizard_core_functionality()
-    
-    # Test integration
-    integration_passed = test_wizard_integration()
-    
-    # Summary
-    print("\n" + "=" * 60)
-    print("📊 TEST SUMMARY")
-    print("=" * 60)
-    print(f"Core Functionality: {'✅ PASSED' if core_passed else '❌ FAILED'}")
-    print(f"PKI Integration: {'✅ PASSED' if integration_passed else '❌ FAILED'}")
-    
-    if core_passed and integration_passed:
-        print("\n🎉 ALL WIZARD TESTS PASSED!")
-        print("\nThe wizard is ready for interactive use:")
-        print("  python3 wizard.py")
-        print("\nFeatures tested:")
-        print("  ✅ Menu system and navigation")
-        print("  ✅ Input validation and error handling")
-        print("  ✅ PKI network integration")
-        print("  ✅ Token creation and verification")
-        print("  ✅ Secure package generation")
-        print("  ✅ Screen management and UI")
-        return True
-    else:
-        print("\n❌ SOME TESTS FAILED")
-        print("Please check the implementation and try again.")
-        return False
+def test_demo_readme_matches_committed_copy():
+    """The demo writes WIZARD_README.md; its embedded copy must not drift from the file"""
+    root = Path(__file__).resolve().parent.parent
+    spec = importlib.util.spec_from_file_location("token_manager_demo", root / "token-manager-demo.py")
+    demo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(demo)
+    assert demo._README_BYTES == (root / "WIZARD_README.md").read_bytes()
 
 if __name__ == "__main__":
-    success = main()
-    sys.exit(0 if success else 1)
\ No newline at end of file
+    raise SystemExit(pytest.main([__file__, "-q"]))
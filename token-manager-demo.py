@@ -1,80 +1,73 @@
 #!/usr/bin/env python3
+"""
+Print a tour of the PKI wizard and write WIZARD_README.md.
+
+Set PKI_DEMO_QUIET=1 to skip the banner (e.g. in CI or when output is
+discarded); the README is still written.
+"""
 
 import os
 import sys
-from token_manager import PKIWizard
 
-def demo_wizard():
-    """Demonstrate wizard functionality"""
-    
-    print("=" * 80)
-    print("🧙‍♂️ PKI TOKEN NETWORK WIZARD DEMONSTRATION")
-    print("=" * 80)
-    print()
-    
-    print("The PKI Wizard provides an interactive interface for:")
-    print()
-    
-    print("🏛️  MASTER TOKEN OPERATIONS:")
-    print("   • Create root certificate authority")
-    print("   • Generate master RSA key pairs")
-    print("   • Initialize PKI network")
-    print()
-    
-    print("📄 TOKEN ISSUANCE:")
-    print("   • Issue tokens to subordinate nodes")
-    print("   • Build hierarchical trust structure")
-    print("   • Automatic signature cascade")
-    print()
-    
-    print("🔍 TOKEN VERIFICATION:")
-    print("   • Chain verification (traditional)")
-    print("   • Master direct verification (instant)")
-    print("   • Hybrid verification (all methods)")
-    print("   • Issuer verification (intermediate)")
-    print()
-    
-    print("📦 SECURE DISTRIBUTION:")
-    print("   • Create secure certificate packages")
-    print("   • Exclude private keys (security)")
-    print("   • Include verification instructions")
-    print("   • Generate compressed archives")
-    print()
-    
-    print("📊 NETWORK MANAGEMENT:")
-    print("   • View network topology")
-    print("   • Token hierarchy visualization")
-    print("   • Detailed token information")
-    print("   • Cryptographic key status")
-    print()
-    
-    print("🎯 WIZARD FEATURES:")
-    print("   ✅ Interactive menu system")
-    print("   ✅ Input validation and error handling")
-    print("   ✅ Step-by-step guidance")
-    print("   ✅ Clear visual feedback")
-    print("   ✅ Confirmation prompts")
-    print("   ✅ Help and instructions")
-    print()
-    
-    print("🚀 USAGE EXAMPLES:")
-    print()
-    
-    print("1. START WIZARD:")
-    print("   python3 wizard.py")
-    print()
-    
-    print("2. TYPICAL WORKFLOW:")
-    print("   → Select 'Create Master Token'")
-    print("   → Enter master node ID (e.g., 'corporate-root')")
-    print("   → Select 'Issue New Token'")
-    print("   → Choose issuer and enter new node details")
-    print("   → Select 'Verify Token' to test")
-    print("   → Select 'Create Secure Package' for distribution")
-    print()
-    
-    print("3. WIZARD MENU STRUCTURE:")
-    print("""
+# Demo banner, joined once at import so demo_wizard() is a single write
+_DEMO_TEXT = "\n".join([
+    "=" * 80,
+    "🧙‍♂️ PKI TOKEN NETWORK WIZARD DEMONSTRATION",
+    "=" * 80,
+    "",
+    "The PKI Wizard provides an interactive interface for:",
+    "",
+    "🏛️  MASTER TOKEN OPERATIONS:",
+    "   • Create root certificate authority",
+    "   • Generate master Ed25519 key pairs",
+    "   • Initialize PKI network",
+    "",
+    "📄 TOKEN ISSUANCE:",
+    "   • Issue tokens to subordinate nodes",
+    "   • Build hierarchical trust structure",
+    "   • Automatic signature cascade",
+    "",
+    "🔍 TOKEN VERIFICATION:",
+    "   • Chain verification (traditional)",
+    "   • Master direct verification (instant)",
+    "   • Hybrid verification (all methods)",
+    "   • Issuer verification (intermediate)",
+    "",
+    "📦 SECURE DISTRIBUTION:",
+    "   • Create secure certificate packages",
+    "   • Exclude private keys (security)",
+    "   • Include verification instructions",
+    "   • Generate compressed archives",
+    "",
+    "📊 NETWORK MANAGEMENT:",
+    "   • View network topology",
+    "   • Token hierarchy visualization",
+    "   • Detailed token information",
+    "   • Cryptographic key status",
+    "",
+    "🎯 WIZARD FEATURES:",
+    "   ✅ Interactive menu system",
+    "   ✅ Input validation and error handling",
+    "   ✅ Step-by-step guidance",
+    "   ✅ Clear visual feedback",
+    "   ✅ Confirmation prompts",
+    "   ✅ Help and instructions",
+    "",
+    "🚀 USAGE EXAMPLES:",
+    "",
+    "1. START WIZARD:",
+    "   python3 token-manager.py",
+    "",
+    "2. TYPICAL WORKFLOW:",
+    "   → Select 'Create Master Token'",
+    "   → Enter master node ID (e.g., 'corporate-root')",
+    "   → Select 'Issue New Token'",
+    "   → Choose issuer and enter new node details",
+    "   → Select 'Verify Token' to test",
+    "   → Select 'Create Secure Package' for distribution",
+    "",
+    "3. WIZARD MENU STRUCTURE:",
+    """
    📋 PKI Token Network Operations
    --------------------------------------------------
      1. 🏛️  Create Master Token
@@ -85,53 +78,63 @@ def demo_wizard():
      6. 🔍 View Token Details
      7. 🔧 Change Storage Directory
      0. Back/Exit
-   """)
-    
-    print("4. VERIFICATION WIZARD SUBMENU:")
-    print("""
+   """,
+    "4. VERIFICATION WIZARD SUBMENU:",
+    """
    📋 Select Verification Method
    --------------------------------------------------
      1. Chain Verification (Traditional)
      2. Master Direct Verification
-     3. Hybrid Verification (All Methods)
-     4. Issuer Verification
+     3. Hybrid Verification (Fastest Method)
+     4. Hybrid Verification (All Methods)
+     5. Issuer Verification
      0. Back/Exit
-   """)
-    
-    print("5. SECURITY FEATURES:")
-    print("   🔒 Private keys never distributed")
-    print("   🔐 RSA 2048-bit cryptographic security")
-    print("   📋 Secure package creation")
-    print("   ✅ Input validation and sanitization")
-    print("   🛡️  Multiple verification methods")
-    print()
-    
-    print("6. USER EXPERIENCE:")
-    print("   • Intuitive numbered menus")
-    print("   • Clear prompts with examples")
-    print("   • Confirmation for destructive actions")
-    print("   • Visual status indicators (✅❌⚠️)")
-    print("   • Comprehensive error messages")
-    print("   • Context-sensitive help")
-    print()
-    
-    print("=" * 80)
-    print("🎉 WIZARD READY FOR USE!")
-    print("=" * 80)
-    print()
-    print("To start the interactive wizard:")
-    print("  python3 wizard.py")
-    print()
-    print("The wizard will guide you through each step with:")
-    print("  • Clear instructions")
-    print("  • Input validation") 
-    print("  • Error handling")
-    print("  • Security best practices")
+   """,
+    "5. SECURITY FEATURES:",
+    "   🔒 Private keys never distributed",
+    "   🔐 Ed25519 signature security",
+    "   📋 Secure package creation",
+    "   ✅ Input validation and sanitization",
+    "   🛡️  Multiple verification methods",
+    "",
+    "6. USER EXPERIENCE:",
+    "   • Intuitive numbered menus",
+    "   • Clear prompts with examples",
+    "   • Confirmation for destructive actions",
+    "   • Visual status indicators (✅❌⚠️)",
+    "   • Comprehensive error messages",
+    "   • Context-sensitive help",
+    "",
+    "=" * 80,
+    "🎉 WIZARD READY FOR USE!",
+    "=" * 80,
+    "",
+    "To start the interactive wizard:",
+    "  python3 token-manager.py",
+    "",
+    "The wizard will guide you through each step with:",
+    "  • Clear instructions",
+    "  • Input validation",
+    "  • Error handling",
+    "  • Security best practices",
+]) + "\n"
+_DEMO_BYTES = _DEMO_TEXT.encode("utf-8")
 
-def create_wizard_readme():
-    """Create README for wizard usage"""
-    
-    readme_content = """# PKI Token Network Wizard
+def demo_wizard():
+    """Demonstrate wizard functionality"""
+    if os.environ.get("PKI_DEMO_QUIET") == "1":
+        return
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        sys.stdout.write(_DEMO_TEXT)
+        return
+    # Text-layer output must land first; the pre-encoded bytes skip it
+    sys.stdout.flush()
+    buffer.write(_DEMO_BYTES)
+    buffer.flush()
+
+# Wizard guide, encoded once; create_wizard_readme() skips the write when unchanged
+_README_BYTES = """# PKI Token Network Wizard
 
 ## Interactive CLI Tool for PKI Operations
 
@@ -161,7 +164,7 @@ The PKI Wizard provides a user-friendly, menu-driven interface for managing your
 
 ```bash
 # Start the wizard
-python3 wizard.py
+python3 token-manager.py
 
 # Follow the interactive prompts
 # No command-line arguments needed!
@@ -203,8 +206,9 @@ Available token issuers:
 📋 Select Verification Method
   1. Chain Verification (Traditional)
   2. Master Direct Verification
-  3. Hybrid Verification (All Methods)
-  4. Issuer Verification
+  3. Hybrid Verification (Fastest Method)
+  4. Hybrid Verification (All Methods)
+  5. Issuer Verification
 
 👉 Select option: 2
 
@@ -275,11 +279,11 @@ The wizard includes comprehensive error handling:
 
 | Feature | CLI Command | Wizard |
 |---------|-------------|---------|
-| Create Master | `cli.py create-master corp-root` | Interactive menu with validation |
-| Issue Token | `cli.py issue corp-root office --data "..."` | Guided selection with issuer list |
-| Verify Token | `cli.py verify office --mode hybrid` | Menu-driven method selection |
-| Secure Package | `python3 secure_distribution.py` | Interactive package creation |
-| View Network | `cli.py list` | Visual hierarchy display |
+| Create Master | `pki-cli.py create-master corp-root` | Interactive menu with validation |
+| Issue Token | `pki-cli.py issue corp-root office --data "..."` | Guided selection with issuer list |
+| Verify Token | `pki-cli.py verify office --mode hybrid` | Menu-driven method selection |
+| Secure Package | `python3 token-packager.py` | Interactive package creation |
+| View Network | `pki-cli.py list` | Visual hierarchy display |
 
 ## Benefits
 
@@ -343,7 +347,7 @@ Verification Methods: chain, master-direct, issuer-direct
 
 2. **Start Wizard**
    ```bash
-   python3 wizard.py
+   python3 token-manager.py
    ```
 
 3. **Follow Interactive Prompts**
@@ -357,10 +361,28 @@ Verification Methods: chain, master-direct, issuer-direct
    - Verify and distribute securely
 
 The wizard makes PKI token management accessible to users of all skill levels while maintaining enterprise-grade security standards.
-"""
+""".encode("utf-8")
+
+def create_wizard_readme():
+    """Create README for wizard usage"""
+    try:
+        with open("WIZARD_README.md", "rb") as f:
+            if f.read() == _README_BYTES:
+                print("✅ WIZARD_README.md is already up to date")
+                return
+    except FileNotFoundError:
+        pass
     
-    with open("WIZARD_README.md", "w") as f:
-        f.write(readme_content)
+    # Raw fd write of the cached bytes: no text or buffering layer in between
+    # O_BINARY (Windows only) keeps the fd from translating newlines
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open("WIZARD_README.md", flags, 0o644)
+    try:
+        view = memoryview(_README_BYTES)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
     
     print("✅ Created WIZARD_README.md with comprehensive usage guide")
 
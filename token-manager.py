@@ -3,59 +3,91 @@
 import os
 import sys
 import json
-from typing import Dict, List, Optional
-from pki_network import PKITokenNetwork
-from token_packager import create_secure_token_package
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple
+
+# Upper bound on remembered verification results in the wizard
+_VERIFY_CACHE_SIZE = 512
+
+@lru_cache(maxsize=None)
+def _level_label(level: int) -> str:
+    """Menu label for a hierarchy level; levels repeat, so each is formatted once"""
+    return "MASTER" if level == 0 else f"Level {level}"
 
 class PKIWizard:
     def __init__(self):
         self.network = None
         self.storage_dir = "token_storage"
+        
+        # (mode, lineage state) -> verification result for this network; cleared
+        # whenever the wizard changes the network, since keys can change too
+        self._verify_cache: Dict[Tuple[str, Tuple], Tuple[bool, Any]] = {}
+        
+        # Screen lines waiting to be written in one go by _flush()
+        self._buf: List[str] = []
+        
+        # Prompt reader; tests swap in a scripted source of answers
+        self._input = input
         self.clear_screen()
         
     def clear_screen(self):
         """Clear terminal screen"""
         os.system('cls' if os.name == 'nt' else 'clear')
     
+    def _out(self, line: str = ""):
+        """Queue a line of screen output"""
+        self._buf.append(line)
+    
+    def _flush(self):
+        """Write queued output with a single write call"""
+        if self._buf:
+            self._buf.append("")
+            sys.stdout.write("\n".join(self._buf))
+            self._buf.clear()
+            sys.stdout.flush()
+    
     def print_header(self):
         """Print wizard header"""
-        print("=" * 80)
-        print("🔐 PKI TOKEN NETWORK WIZARD")
-        print("=" * 80)
-        print("Interactive wizard for PKI token operations")
-        print()
+        self._out("=" * 80)
+        self._out("🔐 PKI TOKEN NETWORK WIZARD")
+        self._out("=" * 80)
+        self._out("Interactive wizard for PKI token operations")
+        self._out()
+        self._flush()
     
     def print_menu(self, title: str, options: List[str]) -> int:
         """Print menu and get user selection"""
-        print(f"\n📋 {title}")
-        print("-" * 50)
+        self._out(f"\n📋 {title}")
+        self._out("-" * 50)
         
         for i, option in enumerate(options, 1):
-            print(f"  {i}. {option}")
+            self._out(f"  {i}. {option}")
         
-        print(f"  0. Back/Exit")
-        print()
+        self._out(f"  0. Back/Exit")
+        self._out()
         
         while True:
             try:
-                choice = input("👉 Select option (0-{}): ".format(len(options)))
+                self._flush()
+                choice = self._input("👉 Select option (0-{}): ".format(len(options)))
                 choice_int = int(choice)
                 if 0 <= choice_int <= len(options):
                     return choice_int
                 else:
-                    print(f"❌ Please enter a number between 0 and {len(options)}")
+                    self._out(f"❌ Please enter a number between 0 and {len(options)}")
             except ValueError:
-                print("❌ Please enter a valid number")
+                self._out("❌ Please enter a valid number")
     
     def get_input(self, prompt: str, required: bool = True, default: str = None) -> str:
         """Get user input with validation"""
         while True:
             if default:
-                user_input = input(f"👉 {prompt} [{default}]: ").strip()
+                user_input = self._input(f"👉 {prompt} [{default}]: ").strip()
                 if not user_input:
                     return default
             else:
-                user_input = input(f"👉 {prompt}: ").strip()
+                user_input = self._input(f"👉 {prompt}: ").strip()
             
             if user_input or not required:
                 return user_input
@@ -64,13 +96,57 @@ class PKIWizard:
     def confirm_action(self, message: str) -> bool:
         """Get confirmation from user"""
         while True:
-            response = input(f"❓ {message} (y/n): ").strip().lower()
+            response = self._input(f"❓ {message} (y/n): ").strip().lower()
             if response in ['y', 'yes']:
                 return True
             elif response in ['n', 'no']:
                 return False
             print("❌ Please enter 'y' or 'n'")
     
+    def _nth_token_id(self, number: int) -> str:
+        """Node ID listed at position number (1-based) on the token menus"""
+        return next(islice(self.network.tokens, number - 1, None))
+    
+    def _cached_verify(self, mode: str, token_id: str) -> Tuple[bool, Any]:
+        """Run a verification mode, reusing the result for an unchanged lineage"""
+        token = self.network.tokens[token_id]
+        key = (mode, self._lineage_state(token_id))
+        
+        result = self._verify_cache.get(key)
+        if result is None:
+            if mode == "chain":
+                result = self.network.verify_token(token_id)
+            elif mode == "master":
+                result = self.network.verify_token_direct_master(token_id)
+            elif mode == "hybrid":
+                result = self.network.verify_token_hybrid(token_id)
+            elif mode == "hybrid-fast":
+                result = self.network.verify_token_hybrid_fast(token_id)
+            else:  # issuer
+                result = self.network.verify_token_as_issuer(token.issuer_id, token_id)
+            
+            if len(self._verify_cache) >= _VERIFY_CACHE_SIZE:
+                del self._verify_cache[next(iter(self._verify_cache))]  # oldest entry
+            self._verify_cache[key] = result
+        return result
+    
+    def _lineage_state(self, token_id: str) -> Tuple:
+        """Hash, link and signature fields of token_id and every issuer above it
+        
+        Any edit to a token on the chain, or a replaced issuer, changes this
+        tuple, so stale cached results are never returned for it.
+        """
+        state = []
+        seen = set()
+        current = self.network.tokens.get(token_id)
+        while current is not None and current.node_id not in seen:
+            seen.add(current.node_id)
+            state.append((current.node_id, current.token_hash, current.issuer_id,
+                          current.issuer_token_hash, current.master_signature,
+                          current.issuer_signature))
+            current = self.network.tokens.get(current.issuer_id) if current.issuer_id else None
+        return tuple(state)
+    
     def setup_network(self):
         """Setup or load PKI network"""
         print("\n🔧 PKI Network Setup")
@@ -86,7 +162,11 @@ class PKIWizard:
                     self.storage_dir = custom_dir
         
         try:
+            # Imported on first use so the welcome screen is drawn before
+            # cryptography loads
+            from pki_network import PKITokenNetwork
             self.network = PKITokenNetwork(self.storage_dir)
+            self._verify_cache.clear()
             print(f"✅ Network loaded successfully")
             
             if self.network.master_token:
@@ -95,11 +175,11 @@ class PKIWizard:
             else:
                 print("⚠️  No master token found - you'll need to create one")
             
-            input("\n📱 Press Enter to continue...")
+            self._input("\n📱 Press Enter to continue...")
             
         except Exception as e:
             print(f"❌ Error loading network: {e}")
-            input("📱 Press Enter to continue...")
+            self._input("📱 Press Enter to continue...")
             return False
         
         return True
@@ -114,7 +194,7 @@ class PKIWizard:
         
         if self.network.master_token:
             print(f"⚠️  Master token already exists: {self.network.master_token.node_id}")
-            input("📱 Press Enter to continue...")
+            self._input("📱 Press Enter to continue...")
             return
         
         print("The master token serves as the root certificate authority.")
@@ -127,7 +207,7 @@ class PKIWizard:
         # Validate node ID
         if not master_id.replace('-', '').replace('_', '').replace('.', '').isalnum():
             print("❌ Node ID can only contain letters, numbers, hyphens, underscores, and dots")
-            input("📱 Press Enter to continue...")
+            self._input("📱 Press Enter to continue...")
             return
         
         print(f"\n📋 Creating master token:")
@@ -139,6 +219,7 @@ class PKIWizard:
         
         try:
             master_token = self.network.create_master_token(master_id)
+            self._verify_cache.clear()
             print(f"\n✅ Master token created successfully!")
             print(f"   Node ID: {master_token.node_id}")
             print(f"   Token Hash: {master_token.token_hash[:32]}...")
@@ -148,7 +229,7 @@ class PKIWizard:
         except Exception as e:
             print(f"❌ Error creating master token: {e}")
         
-        input("\n📱 Press Enter to continue...")
+        self._input("\n📱 Press Enter to continue...")
     
     def issue_token_wizard(self):
         """Wizard for issuing tokens"""
@@ -160,14 +241,12 @@ class PKIWizard:
         
         if not self.network.master_token:
             print("❌ No master token exists. Create a master token first.")
-            input("📱 Press Enter to continue...")
+            self._input("📱 Press Enter to continue...")
             return
         
         # Show available issuers
         print("Available token issuers:")
-        issuers = list(self.network.tokens.keys())
-        for i, issuer in enumerate(issuers, 1):
-            token = self.network.tokens[issuer]
+        for i, (issuer, token) in enumerate(self.network.tokens.items(), 1):
             print(f"  {i}. {issuer} (Level {token.hierarchy_level})")
         
         print()
@@ -177,17 +256,17 @@ class PKIWizard:
         
         try:
             issuer_num = int(issuer_choice)
-            if 1 <= issuer_num <= len(issuers):
-                issuer_id = issuers[issuer_num - 1]
+            if 1 <= issuer_num <= len(self.network.tokens):
+                issuer_id = self._nth_token_id(issuer_num)
             else:
                 print("❌ Invalid issuer number")
-                input("📱 Press Enter to continue...")
+                self._input("📱 Press Enter to continue...")
                 return
         except ValueError:
             issuer_id = issuer_choice
             if issuer_id not in self.network.tokens:
                 print(f"❌ Issuer '{issuer_id}' not found")
-                input("📱 Press Enter to continue...")
+                self._input("📱 Press Enter to continue...")
                 return
         
         # Get new node details
@@ -196,12 +275,12 @@ class PKIWizard:
         # Validate node ID
         if not new_node_id.replace('-', '').replace('_', '').replace('.', '').isalnum():
             print("❌ Node ID can only contain letters, numbers, hyphens, underscores, and dots")
-            input("📱 Press Enter to continue...")
+            self._input("📱 Press Enter to continue...")
             return
         
         if new_node_id in self.network.tokens:
             print(f"❌ Node '{new_node_id}' already exists")
-            input("📱 Press Enter to continue...")
+            self._input("📱 Press Enter to continue...")
             return
         
         token_data = self.get_input("Token description/data", required=False, 
@@ -220,6 +299,7 @@ class PKIWizard:
         
         try:
             new_token = self.network.issue_token(issuer_id, new_node_id, token_data)
+            self._verify_cache.clear()
             print(f"\n✅ Token issued successfully!")
             print(f"   Node ID: {new_token.node_id}")
             print(f"   Issued by: {new_token.issuer_id}")
@@ -231,7 +311,7 @@ class PKIWizard:
         except Exception as e:
             print(f"❌ Error issuing token: {e}")
         
-        input("\n📱 Press Enter to continue...")
+        self._input("\n📱 Press Enter to continue...")
     
     def verify_token_wizard(self):
         """Wizard for token verification"""
@@ -243,15 +323,13 @@ class PKIWizard:
         
         if not self.network.tokens:
             print("❌ No tokens found in network")
-            input("📱 Press Enter to continue...")
+            self._input("📱 Press Enter to continue...")
             return
         
         # Show available tokens
         print("Available tokens:")
-        tokens = list(self.network.tokens.keys())
-        for i, token_id in enumerate(tokens, 1):
-            token = self.network.tokens[token_id]
-            token_type = "MASTER" if token.hierarchy_level == 0 else f"Level {token.hierarchy_level}"
+        for i, (token_id, token) in enumerate(self.network.tokens.items(), 1):
+            token_type = _level_label(token.hierarchy_level)
             print(f"  {i}. {token_id} ({token_type})")
         
         print()
@@ -261,23 +339,24 @@ class PKIWizard:
         
         try:
             token_num = int(token_choice)
-            if 1 <= token_num <= len(tokens):
-                token_id = tokens[token_num - 1]
+            if 1 <= token_num <= len(self.network.tokens):
+                token_id = self._nth_token_id(token_num)
             else:
                 print("❌ Invalid token number")
-                input("📱 Press Enter to continue...")
+                self._input("📱 Press Enter to continue...")
                 return
         except ValueError:
             token_id = token_choice
             if token_id not in self.network.tokens:
                 print(f"❌ Token '{token_id}' not found")
-                input("📱 Press Enter to continue...")
+                self._input("📱 Press Enter to continue...")
                 return
         
         # Verification mode selection
         verification_modes = [
             "Chain Verification (Traditional)",
             "Master Direct Verification", 
+            "Hybrid Verification (Fastest Method)",
             "Hybrid Verification (All Methods)"
         ]
         
@@ -294,21 +373,22 @@ class PKIWizard:
         
         try:
             if mode_choice == 1:  # Chain verification
-                is_valid, chain = self.network.verify_token(token_id)
+                is_valid, chain = self._cached_verify("chain", token_id)
                 print(f"Status: {'✅ VALID' if is_valid else '❌ INVALID'}")
                 print("\nVerification chain:")
                 for i, step in enumerate(chain, 1):
                     print(f"  {i}. {step}")
             
             elif mode_choice == 2:  # Master direct
-                is_valid, result = self.network.verify_token_direct_master(token_id)
+                is_valid, result = self._cached_verify("master", token_id)
                 print(f"Status: {'✅ VALID' if is_valid else '❌ INVALID'}")
                 print("\nMaster direct verification:")
                 for step in result:
                     print(f"  - {step}")
             
-            elif mode_choice == 3:  # Hybrid
-                is_valid, results = self.network.verify_token_hybrid(token_id)
+            elif mode_choice in (3, 4):  # Hybrid: stop at first success, or run all
+                mode = "hybrid-fast" if mode_choice == 3 else "hybrid"
+                is_valid, results = self._cached_verify(mode, token_id)
                 print(f"Overall Status: {'✅ VALID' if is_valid else '❌ INVALID'}")
                 print("\nVerification Results by Method:")
                 for method, (valid, details) in results.items():
@@ -317,10 +397,10 @@ class PKIWizard:
                     for detail in details[:2]:  # Limit output
                         print(f"    - {detail}")
             
-            elif mode_choice == 4:  # Issuer verification
+            elif mode_choice == 5:  # Issuer verification
                 token = self.network.tokens[token_id]
                 if token.issuer_id:
-                    is_valid, result = self.network.verify_token_as_issuer(token.issuer_id, token_id)
+                    is_valid, result = self._cached_verify("issuer", token_id)
                     print(f"Status: {'✅ VALID' if is_valid else '❌ INVALID'}")
                     print(f"\nIssuer verification: {token.issuer_id} → {token_id}")
                     for step in result:
@@ -329,7 +409,7 @@ class PKIWizard:
         except Exception as e:
             print(f"❌ Verification error: {e}")
         
-        input("\n📱 Press Enter to continue...")
+        self._input("\n📱 Press Enter to continue...")
     
     def create_secure_package_wizard(self):
         """Wizard for creating secure distribution packages"""
@@ -341,15 +421,13 @@ class PKIWizard:
         
         if not self.network.tokens:
             print("❌ No tokens found in network")
-            input("📱 Press Enter to continue...")
+            self._input("📱 Press Enter to continue...")
             return
         
         # Show available tokens
         print("Available tokens for packaging:")
-        tokens = list(self.network.tokens.keys())
-        for i, token_id in enumerate(tokens, 1):
-            token = self.network.tokens[token_id]
-            token_type = "MASTER" if token.hierarchy_level == 0 else f"Level {token.hierarchy_level}"
+        for i, (token_id, token) in enumerate(self.network.tokens.items(), 1):
+            token_type = _level_label(token.hierarchy_level)
             print(f"  {i}. {token_id} ({token_type})")
         
         print()
@@ -359,17 +437,17 @@ class PKIWizard:
         
         try:
             token_num = int(token_choice)
-            if 1 <= token_num <= len(tokens):
-                token_id = tokens[token_num - 1]
+            if 1 <= token_num <= len(self.network.tokens):
+                token_id = self._nth_token_id(token_num)
             else:
                 print("❌ Invalid token number")
-                input("📱 Press Enter to continue...")
+                self._input("📱 Press Enter to continue...")
                 return
         except ValueError:
             token_id = token_choice
             if token_id not in self.network.tokens:
                 print(f"❌ Token '{token_id}' not found")
-                input("📱 Press Enter to continue...")
+                self._input("📱 Press Enter to continue...")
                 return
         
         # Get output directory
@@ -386,14 +464,17 @@ class PKIWizard:
             return
         
         try:
+            from token_packager import create_secure_token_package  # only needed here
             create_secure_token_package(self.network, token_id, output_dir)
             
             print(f"\n✅ Secure package created successfully!")
             print(f"   Location: {output_dir}/")
             print(f"   Contents:")
             
-            for file in os.listdir(output_dir):
-                print(f"     📄 {file}")
+            with os.scandir(output_dir) as entries:
+                for entry in entries:
+                    self._out(f"     📄 {entry.name}")
+            self._flush()
             
             print(f"\n🔒 Security Notes:")
             print(f"   ✅ Certificate contains all verification data")
@@ -403,141 +484,141 @@ class PKIWizard:
             
             # Archive option
             if self.confirm_action("Create compressed archive for distribution?"):
+                import gzip
                 import tarfile
                 archive_name = f"{output_dir}.tar.gz"
-                with tarfile.open(archive_name, "w:gz") as tar:
+                # Stream the tar in 1 MiB blocks through fast (level 1) gzip
+                with gzip.GzipFile(archive_name, "wb", compresslevel=1) as gz, \
+                        tarfile.open(fileobj=gz, mode="w|", bufsize=1 << 20) as tar:
                     tar.add(output_dir, arcname=os.path.basename(output_dir))
                 print(f"   📦 Archive created: {archive_name}")
             
         except Exception as e:
             print(f"❌ Error creating package: {e}")
         
-        input("\n📱 Press Enter to continue...")
+        self._input("\n📱 Press Enter to continue...")
     
     def view_network_wizard(self):
         """Wizard for viewing network information"""
         self.clear_screen()
         self.print_header()
         
-        print("📊 NETWORK OVERVIEW")
-        print("-" * 30)
+        self._out("📊 NETWORK OVERVIEW")
+        self._out("-" * 30)
         
         if not self.network.tokens:
-            print("❌ No tokens found in network")
-            input("📱 Press Enter to continue...")
+            self._out("❌ No tokens found in network")
+            self._flush()
+            self._input("📱 Press Enter to continue...")
             return
         
         # Network statistics
+        tokens_by_level = self.network.get_tokens_by_level()
         total_tokens = len(self.network.tokens)
-        max_level = max(token.hierarchy_level for token in self.network.tokens.values())
+        max_level = max(tokens_by_level)
         master_token = self.network.master_token
         
-        print(f"🏛️  Master Token: {master_token.node_id if master_token else 'None'}")
-        print(f"📊 Total Tokens: {total_tokens}")
-        print(f"📈 Maximum Hierarchy Level: {max_level}")
-        print(f"🗂️  Storage Directory: {self.storage_dir}")
-        
-        # Group tokens by level
-        tokens_by_level = {}
-        for token in self.network.tokens.values():
-            level = token.hierarchy_level
-            if level not in tokens_by_level:
-                tokens_by_level[level] = []
-            tokens_by_level[level].append(token)
-        
-        print(f"\n🌳 Hierarchy Structure:")
-        for level in sorted(tokens_by_level.keys()):
+        self._out(f"🏛️  Master Token: {master_token.node_id if master_token else 'None'}")
+        self._out(f"📊 Total Tokens: {total_tokens}")
+        self._out(f"📈 Maximum Hierarchy Level: {max_level}")
+        self._out(f"🗂️  Storage Directory: {self.storage_dir}")
+        
+        self._out(f"\n🌳 Hierarchy Structure:")
+        for level, tokens in tokens_by_level.items():
             level_name = "Master" if level == 0 else f"Level {level}"
-            tokens = tokens_by_level[level]
-            print(f"   {level_name}: {len(tokens)} token(s)")
+            self._out(f"   {level_name}: {len(tokens)} token(s)")
             for token in tokens:
                 issuer_info = f" (issued by {token.issuer_id})" if token.issuer_id else ""
-                print(f"     • {token.node_id}{issuer_info}")
+                self._out(f"     • {token.node_id}{issuer_info}")
         
-        print(f"\n🔑 Cryptographic Keys:")
-        print(f"   Master Keys: {'✅ Present' if self.network.master_private_key else '❌ Missing'}")
-        print(f"   Node Keys: {len(self.network.node_keys)} key pair(s)")
+        self._out(f"\n🔑 Cryptographic Keys:")
+        self._out(f"   Master Keys: {'✅ Present' if self.network.master_private_key else '❌ Missing'}")
+        self._out(f"   Node Keys: {len(self.network.node_keys)} key pair(s)")
         
         # Verification capabilities
-        print(f"\n🔍 Verification Capabilities:")
+        self._out(f"\n🔍 Verification Capabilities:")
         for token_id, token in self.network.tokens.items():
             paths = list(token.verification_paths)
-            print(f"   {token_id}: {', '.join(paths)}")
+            self._out(f"   {token_id}: {', '.join(paths)}")
         
-        input("\n📱 Press Enter to continue...")
+        self._flush()
+        self._input("\n📱 Press Enter to continue...")
     
     def token_details_wizard(self):
         """Wizard for viewing detailed token information"""
         self.clear_screen()
         self.print_header()
         
-        print("🔍 TOKEN DETAILS")
-        print("-" * 30)
+        self._out("🔍 TOKEN DETAILS")
+        self._out("-" * 30)
         
         if not self.network.tokens:
-            print("❌ No tokens found in network")
-            input("📱 Press Enter to continue...")
+            self._out("❌ No tokens found in network")
+            self._flush()
+            self._input("📱 Press Enter to continue...")
             return
         
         # Show available tokens
-        print("Available tokens:")
-        tokens = list(self.network.tokens.keys())
-        for i, token_id in enumerate(tokens, 1):
-            token = self.network.tokens[token_id]
-            token_type = "MASTER" if token.hierarchy_level == 0 else f"Level {token.hierarchy_level}"
-            print(f"  {i}. {token_id} ({token_type})")
+        self._out("Available tokens:")
+        for i, (token_id, token) in enumerate(self.network.tokens.items(), 1):
+            token_type = _level_label(token.hierarchy_level)
+            self._out(f"  {i}. {token_id} ({token_type})")
         
-        print()
+        self._out()
         
         # Get token to view
+        self._flush()
         token_choice = self.get_input("Select token by number or enter node ID")
         
         try:
             token_num = int(token_choice)
-            if 1 <= token_num <= len(tokens):
-                token_id = tokens[token_num - 1]
+            if 1 <= token_num <= len(self.network.tokens):
+                token_id = self._nth_token_id(token_num)
             else:
-                print("❌ Invalid token number")
-                input("📱 Press Enter to continue...")
+                self._out("❌ Invalid token number")
+                self._flush()
+                self._input("📱 Press Enter to continue...")
                 return
         except ValueError:
             token_id = token_choice
             if token_id not in self.network.tokens:
-                print(f"❌ Token '{token_id}' not found")
-                input("📱 Press Enter to continue...")
+                self._out(f"❌ Token '{token_id}' not found")
+                self._flush()
+                self._input("📱 Press Enter to continue...")
                 return
         
         # Display token details
         token = self.network.tokens[token_id]
         
-        print(f"\n📄 Token Details: {token_id}")
-        print("-" * 50)
-        print(f"Node ID: {token.node_id}")
-        print(f"Token Hash: {token.token_hash}")
-        print(f"Master ID: {token.master_id}")
-        print(f"Issuer ID: {token.issuer_id or 'None (Master)'}")
-        print(f"Hierarchy Level: {token.hierarchy_level}")
-        print(f"Token Data: {token.token_data}")
-        print(f"Timestamp: {token.timestamp}")
-        print(f"Token ID: {token.token_id}")
-        
-        print(f"\n🔍 Verification Information:")
-        print(f"Available Methods: {', '.join(token.verification_paths)}")
-        print(f"Has Master Signature: {'✅ Yes' if token.master_signature else '❌ No'}")
-        print(f"Has Issuer Signature: {'✅ Yes' if token.issuer_signature else '❌ No'}")
+        self._out(f"\n📄 Token Details: {token_id}")
+        self._out("-" * 50)
+        self._out(f"Node ID: {token.node_id}")
+        self._out(f"Token Hash: {token.token_hash}")
+        self._out(f"Master ID: {token.master_id}")
+        self._out(f"Issuer ID: {token.issuer_id or 'None (Master)'}")
+        self._out(f"Hierarchy Level: {token.hierarchy_level}")
+        self._out(f"Token Data: {token.token_data}")
+        self._out(f"Timestamp: {token.timestamp}")
+        self._out(f"Token ID: {token.token_id}")
+        
+        self._out(f"\n🔍 Verification Information:")
+        self._out(f"Available Methods: {', '.join(token.verification_paths)}")
+        self._out(f"Has Master Signature: {'✅ Yes' if token.master_signature else '❌ No'}")
+        self._out(f"Has Issuer Signature: {'✅ Yes' if token.issuer_signature else '❌ No'}")
         
         if token.issuer_token_hash:
-            print(f"Issuer Token Hash: {token.issuer_token_hash}")
+            self._out(f"Issuer Token Hash: {token.issuer_token_hash}")
         
         # Test verification
-        print(f"\n🧪 Quick Verification Test:")
+        self._out(f"\n🧪 Quick Verification Test:")
         try:
-            is_valid, _ = self.network.verify_token_hybrid(token_id)
-            print(f"Verification Status: {'✅ VALID' if is_valid else '❌ INVALID'}")
+            is_valid, _ = self._cached_verify("hybrid-fast", token_id)
+            self._out(f"Verification Status: {'✅ VALID' if is_valid else '❌ INVALID'}")
         except Exception as e:
-            print(f"Verification Error: {e}")
+            self._out(f"Verification Error: {e}")
         
-        input("\n📱 Press Enter to continue...")
+        self._flush()
+        self._input("\n📱 Press Enter to continue...")
     
     def main_menu(self):
         """Main wizard menu"""
@@ -588,7 +669,7 @@ class PKIWizard:
                         print("✅ Storage directory changed successfully")
                     else:
                         print("❌ Failed to load network from new directory")
-                    input("📱 Press Enter to continue...")
+                    self._input("📱 Press Enter to continue...")
     
     def run(self):
         """Run the wizard"""